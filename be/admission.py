@@ -0,0 +1,192 @@
+import os
+import math
+import time
+import asyncio
+from collections import deque
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", "16"))            # 동시에 실행하는 리뷰 요청 수
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))              # 실행을 기다리는 요청 수 (초과 시 503)
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))    # 최대 대기 시간(초, 초과 시 503)
+ADMISSION_RATE = float(os.getenv("ADMISSION_RATE", "0"))                       # 클라이언트별 초당 허용 요청 수 (0이면 제한 없음)
+ADMISSION_BURST = int(os.getenv("ADMISSION_BURST", "10"))                      # 클라이언트별 순간 최대 요청 수
+ADMISSION_MAX_CLIENTS = int(os.getenv("ADMISSION_MAX_CLIENTS", "10000"))       # 요청 한도를 추적하는 최대 클라이언트 수
+ADMISSION_CLIENT_HEADER = os.getenv("ADMISSION_CLIENT_HEADER", "")             # 클라이언트 식별 헤더 (비어 있으면 접속 주소 사용, FE는 X-Client-Id로 세션 ID 전달)
+
+
+class AdmissionRejected(Exception):
+    ''' AdmissionRejected
+        요청을 받을 수 없을 때 발생 (status_code: 429 요청 한도 초과, 503 대기열 초과·대기 시간 초과)
+    '''
+    def __init__(self, status_code: int, reason: str, message: str, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionTicket:
+    ''' AdmissionTicket
+        acquire로 얻은 실행 슬롯 (release는 한 번만 반영되므로 여러 경로에서 호출해도 안전)
+    '''
+    def __init__(self):
+        self.started = time.monotonic()
+        self.released = False
+
+
+class TokenBuckets:
+    ''' TokenBuckets
+        클라이언트별 토큰 버킷 요청 한도 (초당 rate개씩 채워지고 최대 burst개까지 쌓임)
+    '''
+    def __init__(self, rate: float = ADMISSION_RATE, burst: int = ADMISSION_BURST, max_clients: int = ADMISSION_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = {}      # 클라이언트 -> (남은 토큰 수, 갱신 시각)
+
+    def take(self, client: str) -> float:
+        ''' take
+            클라이언트의 토큰 하나를 사용
+            I: 클라이언트 식별자 (String)
+            O: 0이면 허용, 아니면 다음 토큰까지 기다려야 하는 시간(초)
+        '''
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+        if client not in self._buckets and len(self._buckets) >= self.max_clients:
+            self._purge(now)
+        self._buckets[client] = (tokens - 1, now)
+
+        return 0.0
+
+    def _purge(self, now: float):
+        # 토큰이 가득 찬(한동안 요청이 없던) 클라이언트는 새로 만든 버킷과 같으므로 제거
+        full_after = self.burst / self.rate
+        self._buckets = {client: (tokens, updated) for client, (tokens, updated) in self._buckets.items()
+                         if now - updated < full_after}
+
+
+class AdmissionController:
+    ''' AdmissionController
+        리뷰 요청의 수락 여부와 실행 순서를 결정
+        - 클라이언트별 요청 한도(TokenBuckets)를 넘으면 429
+        - 동시에 max_active개까지 실행하고 나머지는 도착 순서대로 대기, 대기열이 가득 차거나 queue_timeout을 넘으면 503
+        정적 분석 도구와 LLM 호출의 동시 실행 수는 각각 ANALYZER_MAX_CONCURRENCY, LLM_MAX_CONCURRENCY로 따로 제한됨
+    '''
+    def __init__(self, max_active: int = ADMISSION_MAX_ACTIVE, max_queue: int = ADMISSION_MAX_QUEUE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT, buckets: TokenBuckets | None = None):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.buckets = buckets or TokenBuckets()
+        self._active = 0
+        self._waiters = deque()
+        self._avg_run_seconds = 1.0     # 요청 실행 시간의 지수 이동 평균 (Retry-After 추정에 사용)
+        self._counters = {"admitted": 0, "rate_limited": 0, "queue_full": 0, "queue_timeout": 0,
+                          "wait_seconds_total": 0.0}
+
+    def check_rate(self, client: str):
+        ''' check_rate
+            클라이언트의 요청 한도를 확인 (넘으면 AdmissionRejected(429) 예외 발생)
+            I: 클라이언트 식별자 (String)
+        '''
+        retry_after = self.buckets.take(client)
+        if retry_after:
+            self._counters["rate_limited"] += 1
+            raise AdmissionRejected(429, "rate_limited", "Too many requests from this client", retry_after)
+
+    async def acquire(self, client: str) -> AdmissionTicket:
+        ''' acquire
+            요청 한도를 확인하고 실행 슬롯을 얻을 때까지 대기 (끝나면 반드시 release 호출)
+            I: 클라이언트 식별자 (String)
+            O: 실행 슬롯 (AdmissionTicket) - 받을 수 없으면 AdmissionRejected 예외 발생
+        '''
+        self.check_rate(client)
+
+        return await self.acquire_slot()
+
+    async def acquire_slot(self) -> AdmissionTicket:
+        ''' acquire_slot
+            요청 한도 확인 없이 실행 슬롯을 얻을 때까지 대기 (배치 리뷰처럼 요청 한도는 요청 단위로 한 번만 확인하고 파일마다 슬롯을 얻을 때 사용)
+            O: 실행 슬롯 (AdmissionTicket) - 받을 수 없으면 AdmissionRejected(503) 예외 발생
+        '''
+        started = time.monotonic()
+        if self._active < self.max_active and not self._waiters:
+            self._active += 1
+        else:
+            await self._wait()
+
+        self._counters["admitted"] += 1
+        self._counters["wait_seconds_total"] += time.monotonic() - started
+
+        return AdmissionTicket()
+
+    def release(self, ticket: AdmissionTicket):
+        ''' release
+            실행 슬롯을 반납하고 가장 오래 기다린 요청에 넘겨줌 (이미 반납한 슬롯이면 무시)
+            I: acquire가 반환한 실행 슬롯 (AdmissionTicket)
+        '''
+        if ticket.released:
+            return
+        ticket.released = True
+        self._avg_run_seconds = 0.9 * self._avg_run_seconds + 0.1 * (time.monotonic() - ticket.started)
+        self._hand_over()
+
+    def _hand_over(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> dict:
+        ''' stats
+            실행 중인 요청 수, 대기열 길이, 수락·거절 횟수 등 반환
+        '''
+        return dict(
+            self._counters,
+            active=self._active,
+            queue_depth=len(self._waiters),
+            max_active=self.max_active,
+            max_queue=self.max_queue,
+            avg_run_seconds=self._avg_run_seconds,
+        )
+
+    async def _wait(self):
+        if len(self._waiters) >= self.max_queue:
+            self._counters["queue_full"] += 1
+            raise AdmissionRejected(503, "queue_full", f"Review queue is full ({self.max_queue})", self._estimate_wait())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # asyncio.wait_for는 취소와 슬롯 전달이 겹치면 취소를 무시하고 결과를 반환하므로(Python 3.11) asyncio.timeout 사용
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # 시간 초과·취소와 동시에 슬롯을 넘겨받은 경우 다음 요청에 넘겨줌
+                self._hand_over()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self._counters["queue_timeout"] += 1
+                raise AdmissionRejected(503, "queue_timeout", "Timed out waiting for a review slot", self._estimate_wait())
+            raise
+
+    def _estimate_wait(self) -> float:
+        # 앞선 대기 요청이 모두 실행될 때까지 걸리는 예상 시간
+        return self._avg_run_seconds * (len(self._waiters) + 1) / self.max_active
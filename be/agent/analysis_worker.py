@@ -0,0 +1,187 @@
+import io
+import os
+import sys
+import time
+import queue
+import threading
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+
+'''
+====================
+     WORKER POOL
+====================
+'''
+
+class AnalysisWorkerPool:
+    ''' AnalysisWorkerPool
+        정적 분석 도구(pylint, flake8, bandit, mypy)를 미리 import 해 둔 상주 프로세스 풀
+        요청마다 인터프리터를 새로 띄우지 않고 각 도구의 Python API를 프로세스 안에서 호출
+        제한 시간을 넘긴 워커는 강제 종료 후 새 워커로 교체
+    '''
+    def __init__(self, size: int):
+        self.size = size
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+            self._started = True
+
+    def shutdown(self):
+        with self._lock:
+            while not self._idle.empty():
+                process, conn = self._idle.get_nowait()
+                conn.close()
+                process.kill()
+            self._started = False
+
+    def run(self, command: list[str], timeout: float, cwd: str | None = None, stdin: str | None = None) -> dict:
+        ''' run
+            유휴 워커에서 도구를 실행 (유휴 워커가 없으면 대기)
+            I: 실행 명령어 (LIST<String>, 첫 요소가 도구명), 제한 시간 (Float), 작업 폴더 (String), 표준 입력으로 전달할 코드 (String)
+            O: ToolResult 형식의 실행 결과 (DICT)
+        '''
+        self.start()
+        started = time.perf_counter()
+        process, conn = self._idle.get()
+        try:
+            conn.send((command, cwd, stdin))
+            if conn.poll(timeout):
+                status, output = conn.recv()
+                self._idle.put((process, conn))
+                return {"status": status, "output": output, "elapsed": time.perf_counter() - started}
+        except (EOFError, OSError):
+            pass
+
+        # 제한 시간 초과 또는 워커 비정상 종료: 워커를 교체하여 다음 요청이 막히지 않도록 함
+        timed_out = process.is_alive()
+        process.kill()
+        conn.close()
+        self._idle.put(self._spawn())
+        if timed_out:
+            return {"status": "timeout", "output": f"{command[0]} did not finish within {timeout:g}s", "elapsed": time.perf_counter() - started}
+
+        return {"status": "error", "output": f"{command[0]} worker exited unexpectedly", "elapsed": time.perf_counter() - started}
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+
+        return process, parent_conn
+
+
+'''
+====================
+       WORKER
+====================
+'''
+
+def _worker_main(conn):
+    # 도구들의 무거운 의존성은 워커 시작 시 한 번만 import
+    runners = _load_runners()
+
+    while True:
+        try:
+            command, cwd, stdin = conn.recv()
+        except EOFError:
+            return
+
+        tool, args = command[0], command[1:]
+        if tool not in runners:
+            conn.send(("missing", f"{tool} is not installed"))
+            continue
+
+        try:
+            conn.send(("ok", _run_in_process(runners[tool], args, cwd, stdin)))
+        except Exception as e:
+            conn.send(("error", f"{tool} failed: {e}"))
+
+def _load_runners() -> dict:
+    runners = {}
+    try:
+        from pylint.lint import Run as PylintRun
+        runners["pylint"] = lambda args: (PylintRun(args, exit=False), _forget_analyzed_modules())
+    except ImportError:
+        pass
+    try:
+        from flake8.main.cli import main as flake8_main
+        from flake8.utils import stdin_get_value
+        # flake8은 표준 입력 내용을 프로세스 단위로 캐시하므로 실행마다 비움
+        runners["flake8"] = lambda args: (stdin_get_value.cache_clear(), flake8_main(args))
+    except ImportError:
+        pass
+    try:
+        from bandit.cli.main import main as bandit_main
+        runners["bandit"] = lambda args: _run_with_argv(bandit_main, ["bandit", *args])
+    except ImportError:
+        pass
+    try:
+        from mypy import api as mypy_api
+        runners["mypy"] = lambda args: print(mypy_api.run(args)[0], end="")
+    except ImportError:
+        pass
+
+    return runners
+
+class _CapturedOutput(io.TextIOWrapper):
+    # 메모리 출력 버퍼 - flake8은 sys.stdout.buffer에 바이트로 쓰고, bandit은 출력 파일의 name을 확인한 뒤 파일을 닫으므로
+    # 바이트 버퍼를 갖고, 닫아도 내용이 유지되도록 함
+    name = "<captured>"
+
+    def __init__(self):
+        super().__init__(io.BytesIO(), encoding="utf-8", write_through=True)
+
+    def close(self):
+        self.flush()
+
+    def getvalue(self) -> str:
+        self.flush()
+        return self.buffer.getvalue().decode("utf-8")
+
+
+def _run_in_process(runner, args: list[str], cwd: str | None, stdin: str | None = None) -> str:
+    ''' _run_in_process
+        도구를 현재 프로세스에서 실행하고 표준 출력을 문자열로 반환 (출력은 파일을 거치지 않고 메모리에서 수집)
+        I: 도구 실행 함수, 인자 목록, 작업 폴더, 표준 입력으로 전달할 코드 (String)
+    '''
+    previous_cwd, previous_stdin = os.getcwd(), sys.stdin
+    out = _CapturedOutput()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        if stdin is not None:
+            sys.stdin = io.TextIOWrapper(io.BytesIO(stdin.encode("utf-8")), encoding="utf-8")
+        with redirect_stdout(out), redirect_stderr(io.StringIO()):
+            try:
+                runner(args)
+            except SystemExit:
+                pass
+        return out.getvalue()
+    finally:
+        os.chdir(previous_cwd)
+        sys.stdin = previous_stdin
+
+def _run_with_argv(main, argv: list[str]):
+    previous_argv = sys.argv
+    sys.argv = argv
+    try:
+        main()
+    finally:
+        sys.argv = previous_argv
+
+def _forget_analyzed_modules():
+    # astroid는 모듈명+경로로 AST를 캐시하므로, 분석 대상 코드의 AST는 매번 버리고 설치된 라이브러리의 AST만 유지
+    from astroid import MANAGER
+    prefixes = tuple({sys.prefix, sys.base_prefix, sys.exec_prefix})
+    for name, module in list(MANAGER.astroid_cache.items()):
+        if module.file and not module.file.startswith(prefixes):
+            MANAGER.astroid_cache.pop(name, None)
\ No newline at end of file
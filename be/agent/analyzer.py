@@ -0,0 +1,377 @@
+import os
+import re
+import ast
+import time
+import asyncio
+import weakref
+import subprocess
+from functools import lru_cache
+from typing import TypedDict, Literal
+from concurrent.futures import ThreadPoolExecutor
+from .analysis_worker import AnalysisWorkerPool
+from .workspace import Workspace
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+# 도구별 실행 제한 시간(초) 및 프로세스 전체에서 동시에 실행 가능한 분석 도구 수
+TOOL_TIMEOUT = float(os.getenv("ANALYZER_TIMEOUT", "30"))
+MAX_CONCURRENCY = int(os.getenv("ANALYZER_MAX_CONCURRENCY", str(os.cpu_count() or 4)))
+
+# 분석 실행 방식
+# - worker: 도구들을 미리 import 해 둔 상주 프로세스에서 Python API로 실행 (기본값)
+# - subprocess: 분석할 때마다 도구별 프로세스를 새로 실행
+BACKEND = os.getenv("ANALYZER_BACKEND", "worker")
+# mypy 증분 캐시 폴더 (요청·재시작 간에 재사용)
+MYPY_CACHE_DIR = os.getenv("ANALYZER_MYPY_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "code_review", "mypy"))
+# 1이면 실행할 수 없는 분석 도구가 있을 때 서버를 시작하지 않음 (0이면 경고만 출력하고 준비 상태 확인(/health/ready)에서 503)
+REQUIRE_TOOLS = os.getenv("ANALYZER_REQUIRE_TOOLS", "0") == "1"
+
+# bandit 결과를 다른 도구와 같은 "경로:줄번호:열:" 한 줄 형식으로 출력 (앞에 {abspath} 또는 {relpath}를 붙여 사용)
+BANDIT_MSG_TEMPLATE = ":{line}:{col}: {test_id}[{severity}/{confidence}]: {msg}"
+
+# 도구명: 분석 대상 파일 경로를 받아 실행 명령어를 만드는 함수
+STATIC_TOOLS = {
+    "pylint": lambda path: ["pylint", path, "--disable=all", "--enable=E,W,C,R", "--persistent=n"], # E: Error, W: Warning, C: Convention, R: Refactor
+    "flake8": lambda path: ["flake8", "-", "--stdin-display-name", os.path.basename(path)],
+    "bandit": lambda path: ["bandit", path, "-q", "-f", "custom", "--msg-template", "{abspath}" + BANDIT_MSG_TEMPLATE],
+    "mypy": lambda path: ["mypy", path, "--cache-dir", MYPY_CACHE_DIR],
+}
+# 파일 대신 표준 입력으로 코드를 받는 도구
+# (bandit도 "-"를 지원하지만 OS 표준 입력 fd를 직접 읽으므로 상주 프로세스에서는 사용할 수 없어 파일로 분석)
+STDIN_TOOLS = {"flake8"}
+
+# 여러 파일을 한 번에 분석할 때 사용하는 명령어 (작업 폴더 기준 상대 경로로 실행, 결과는 "경로:줄번호:..." 형식)
+BATCH_STATIC_TOOLS = {
+    "pylint": ["pylint", "--recursive=y", ".", "--disable=all", "--enable=E,W,C,R", "--persistent=n"],
+    "flake8": ["flake8", "."],
+    "bandit": ["bandit", "-r", ".", "-q", "-f", "custom", "--msg-template", "{relpath}" + BANDIT_MSG_TEMPLATE],
+    "mypy": ["mypy", "--explicit-package-bases", ".", "--cache-dir", MYPY_CACHE_DIR],
+}
+BATCH_TOOL_TIMEOUT = float(os.getenv("ANALYZER_BATCH_TIMEOUT", "300"))
+
+# 모든 요청이 공유하는 실행 풀 (풀 크기가 곧 전역 동시 실행 상한)
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="analyzer")
+# 비동기 경로에서 사용하는 전역 동시 실행 상한 (asyncio.Semaphore는 이벤트 루프에 묶이므로 루프별로 생성)
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+# worker 방식에서 사용하는 상주 프로세스 풀
+_workers = AnalysisWorkerPool(size=MAX_CONCURRENCY)
+# 분석할 코드를 저장하는 재사용 작업 폴더 (tmpfs)
+_workspace = Workspace()
+
+# 도구별 출력 한 줄을 Finding으로 변환하는 패턴
+_FINDING_PATTERNS = {
+    "pylint": re.compile(r"^[^:\n]+:(?P<line>\d+):(?P<column>\d+): (?P<code>[A-Z]\d{4}): (?P<message>.*)$"),
+    "flake8": re.compile(r"^[^:\n]+:(?P<line>\d+):(?P<column>\d+): (?P<code>[A-Z]+\d+) (?P<message>.*)$"),
+    "bandit": re.compile(r"^[^:\n]+:(?P<line>\d+):(?P<column>-?\d+): (?P<code>B\d+\[\w+/\w+\]): (?P<message>.*)$"),
+    "mypy": re.compile(r"^[^:\n]+:(?P<line>\d+):(?:(?P<column>\d+):)? error: (?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$"),
+}
+_PYLINT_SCORE = re.compile(r"rated at (-?[\d.]+)/10")
+
+# flake8과 pylint가 같은 문제를 보고하는 코드 (flake8 -> pylint), 같은 줄에 pylint 결과가 있으면 flake8 결과는 생략
+_DUPLICATE_CODES = {
+    "W291": "C0303", "W293": "C0303", "E501": "C0301", "W292": "C0304", "W391": "C0305",
+    "F401": "W0611", "F841": "W0612", "F821": "E0602", "E722": "W0702", "E999": "E0001",
+}
+
+
+class ToolResult(TypedDict):
+    status: Literal["ok", "timeout", "missing", "error"]
+    output: str
+    elapsed: float
+
+
+class Finding(TypedDict):
+    tool: str
+    line: int
+    column: int
+    code: str           # 예: C0303(pylint), W291(flake8), B605[HIGH/HIGH](bandit), arg-type(mypy)
+    message: str
+
+
+class AnalysisReport(TypedDict):
+    pylint_score: float | None
+    findings: list[Finding]         # 줄 번호 순으로 정렬되고 중복이 제거된 분석 결과
+    failed: dict[str, str]          # 실행되지 못한 도구: 상태 (timeout, missing, error)
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+async def arun_static_analysis(code: str, timeout: float = TOOL_TIMEOUT) -> dict[str, ToolResult]:
+    ''' arun_static_analysis
+        주어진 Python 코드를 작업 폴더(tmpfs)에 저장한 후, 정적 분석 도구들을 병렬로 실행 (STDIN_TOOLS는 표준 입력으로 전달)
+        시간 초과나 실행 실패가 발생한 도구는 상태만 기록하고 나머지 결과는 그대로 반환 (부분 리포트)
+        asyncio 서브프로세스를 사용하므로 이벤트 루프를 막지 않음
+        I: 문자열 형식의 파이썬 코드 (String), 도구별 제한 시간 (Float)
+        O: 도구별 실행 결과 (DICT<도구명(String): ToolResult>)
+    '''
+    # 고정된 파일명을 사용하고 출력에서 작업 폴더 경로를 제거하여, 같은 코드는 항상 같은 리포트가 되도록 함
+    with _workspace.acquire() as tmp_dir:
+        tmp_path = os.path.join(tmp_dir, "code.py")
+        with open(tmp_path, 'w') as tmp:
+            tmp.write(code)
+
+        outputs = await asyncio.gather(*[
+            _arun_tool(build_command(tmp_path), timeout, stdin=code if tool in STDIN_TOOLS else None)
+            for tool, build_command in STATIC_TOOLS.items()
+        ])
+        results = dict(zip(STATIC_TOOLS, outputs))
+
+    for result in results.values():
+        result['output'] = _workspace.strip_paths(result['output'])
+
+    return results
+
+async def arun_static_analysis_batch(files: dict[str, str], timeout: float = BATCH_TOOL_TIMEOUT) -> dict[str, dict[str, ToolResult]]:
+    ''' arun_static_analysis_batch
+        여러 파일을 하나의 임시 폴더에 저장한 후, 도구별로 한 번만 실행하여 결과를 파일별로 나눠 반환
+        문법 오류가 있는 파일은 arun_static_analysis로 따로 분석하고, pylint 점수는 파일별로 계산
+        I: 파일별 코드 (DICT<상대 경로(String): 코드(String)>), 도구별 제한 시간 (Float)
+        O: 파일별·도구별 실행 결과 (DICT<상대 경로(String): DICT<도구명(String): ToolResult>>)
+    '''
+    # 문법 오류가 있는 파일은 공유 실행에 넣으면 mypy가 전체 분석을 중단하므로 파일별로 따로 분석
+    valid = {path: code for path, code in files.items() if _parses(code)}
+    broken = [path for path in files if path not in valid]
+
+    async def run_shared():
+        if not valid:
+            return []
+        with _workspace.acquire() as tmp_dir:
+            for path, code in valid.items():
+                file_path = os.path.join(tmp_dir, path)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, 'w') as f:
+                    f.write(code)
+
+            return await asyncio.gather(*[
+                _arun_tool(command, timeout, cwd=tmp_dir) for command in BATCH_STATIC_TOOLS.values()
+            ])
+
+    outputs, *separate = await asyncio.gather(run_shared(), *[arun_static_analysis(files[path]) for path in broken])
+
+    per_file = {path: {} for path in valid}
+    for tool, result in zip(BATCH_STATIC_TOOLS, outputs):
+        lines = {path: [] for path in valid}
+        for line in result['output'].splitlines():
+            line = line.removeprefix("./")
+            path = line.split(":", 1)[0]
+            if path in lines:
+                lines[path].append(line)
+
+        for path, code in valid.items():
+            output = '\n'.join(lines[path]) if result['status'] == "ok" else result['output']
+            # 공유 실행의 점수는 전체 파일 기준이므로 파일별 점수를 메시지 수로 다시 계산
+            if tool == "pylint" and result['status'] == "ok":
+                output += f"\nYour code has been rated at {_pylint_rating(code, lines[path]):.2f}/10"
+            per_file[path][tool] = {"status": result['status'], "output": output, "elapsed": result['elapsed']}
+
+    per_file.update(zip(broken, separate))
+    return {path: per_file[path] for path in files}
+
+def parse_findings(tool: str, output: str) -> list[Finding]:
+    ''' parse_findings
+        도구의 텍스트 출력에서 "경로:줄번호:..." 형식의 결과를 Finding 목록으로 변환 (그 외 줄은 무시)
+        I: 도구명 (String), 도구 출력 (String)
+        O: 분석 결과 목록 (LIST<Finding>)
+    '''
+    pattern = _FINDING_PATTERNS[tool]
+    findings = []
+    for line in output.splitlines():
+        match = pattern.match(line.strip())
+        if match is None:
+            continue
+        findings.append({
+            "tool": tool,
+            "line": int(match['line']),
+            "column": int(match['column'] or 0),
+            "code": match['code'] or "error",
+            "message": match['message'].strip(),
+        })
+
+    return findings
+
+def build_report(results: dict[str, ToolResult]) -> AnalysisReport:
+    ''' build_report
+        도구별 실행 결과를 구조화된 분석 결과로 변환
+        같은 줄의 동일한 결과와 flake8·pylint가 중복 보고한 결과(_DUPLICATE_CODES)는 하나만 남김
+        I: 도구별 실행 결과 (DICT<도구명(String): ToolResult>)
+        O: 분석 결과 (AnalysisReport)
+    '''
+    findings, failed, pylint_score = [], {}, None
+    for tool, result in results.items():
+        if result['status'] != "ok":
+            failed[tool] = result['status']
+            continue
+        findings += parse_findings(tool, result['output'])
+        if tool == "pylint":
+            score = _PYLINT_SCORE.search(result['output'])
+            pylint_score = float(score.group(1)) if score else None
+
+    reported = {(finding['line'], finding['code']) for finding in findings if finding['tool'] == "pylint"}
+    unique, seen = [], set()
+    for finding in sorted(findings, key=lambda f: (f['line'], f['column'], f['tool'], f['code'])):
+        key = (finding['tool'], finding['line'], finding['code'], finding['message'])
+        if key in seen:
+            continue
+        if finding['tool'] == "flake8" and (finding['line'], _DUPLICATE_CODES.get(finding['code'])) in reported:
+            continue
+        seen.add(key)
+        unique.append(finding)
+
+    return {"pylint_score": pylint_score, "findings": unique, "failed": failed}
+
+def filter_report(report: AnalysisReport, ranges: list[tuple[int, int]]) -> AnalysisReport:
+    ''' filter_report
+        주어진 줄 범위 안의 분석 결과만 남긴 리포트 반환 (청크·증분 리뷰에서 사용)
+        I: 분석 결과 (AnalysisReport), (시작 줄, 끝 줄) 목록 (LIST<Tuple>)
+        O: 분석 결과 (AnalysisReport)
+    '''
+    findings = [finding for finding in report['findings']
+                if any(start <= finding['line'] <= end for start, end in ranges)]
+
+    return dict(report, findings=findings)
+
+def format_report(report: AnalysisReport) -> str:
+    ''' format_report
+        분석 결과를 LLM 프롬프트에 넣을 간결한 텍스트로 변환
+        같은 도구·코드·메시지의 결과는 한 줄로 묶어 줄 번호만 나열 (예: "12, 21: pylint C0303 Trailing whitespace")
+        I: 분석 결과 (AnalysisReport)
+        O: 정적 분석 리포트 (String)
+    '''
+    lines = []
+    if report['pylint_score'] is not None:
+        lines.append(f"pylint score: {report['pylint_score']:.2f}/10")
+    if report['failed']:
+        lines.append("not run: " + ", ".join(f"{tool} ({status})" for tool, status in report['failed'].items()))
+
+    grouped = {}
+    for finding in report['findings']:
+        grouped.setdefault((finding['tool'], finding['code'], finding['message']), []).append(finding['line'])
+    if not grouped:
+        lines.append("no findings")
+        return "\n".join(lines) + "\n"
+
+    lines.append("findings (line: tool code message):")
+    for (tool, code, message), line_numbers in grouped.items():
+        line_numbers = ", ".join(str(line) for line in dict.fromkeys(line_numbers))
+        lines.append(f"{line_numbers}: {tool} {code} {message}")
+
+    return "\n".join(lines) + "\n"
+
+def start_workers():
+    ''' start_workers
+        worker 방식일 때 상주 분석 프로세스를 미리 띄워 둠 (서버 시작 시 호출, 첫 요청의 지연 방지)
+    '''
+    if BACKEND == "worker":
+        _workers.start()
+
+def stop_workers():
+    _workers.shutdown()
+
+@lru_cache(maxsize=1)
+def tool_versions() -> dict[str, str]:
+    ''' tool_versions
+        설치된 정적 분석 도구들의 버전 문자열 반환 (프로세스당 한 번만 조회, 캐시 키 구성에 사용)
+        O: 도구별 버전 (DICT<도구명(String): 버전(String)>)
+    '''
+    results = _executor.map(lambda tool: _run_subprocess([tool, "--version"], TOOL_TIMEOUT), STATIC_TOOLS)
+
+    return {
+        tool: result['output'].strip() if result['status'] == "ok" else result['status']
+        for tool, result in zip(STATIC_TOOLS, results)
+    }
+
+def missing_tools() -> list[str]:
+    ''' missing_tools
+        실행할 수 없는(설치되지 않았거나 버전 조회에 실패한) 분석 도구 목록 반환
+        O: 도구명 목록 (LIST<String>)
+    '''
+    return [tool for tool, version in tool_versions().items() if version in ("timeout", "missing", "error")]
+
+def _parses(code: str) -> bool:
+    ''' _parses
+        코드가 Python 문법에 맞는지 확인
+        I: 문자열 형식의 파이썬 코드 (String)
+        O: 문법 오류가 없으면 True (Bool)
+    '''
+    try:
+        ast.parse(code)
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+def _pylint_rating(code: str, lines: list[str]) -> float:
+    ''' _pylint_rating
+        pylint 기본 평가식으로 한 파일의 점수를 계산 (문장 수는 ast 기준)
+        I: 문자열 형식의 파이썬 코드 (String), 해당 파일의 pylint 출력 줄 목록 (LIST<String>)
+        O: 0~10 사이 점수 (Float)
+    '''
+    statements = sum(isinstance(node, (ast.stmt, ast.excepthandler)) for node in ast.walk(ast.parse(code)))
+    counts = {category: 0 for category in "FEWRC"}
+    for finding in parse_findings("pylint", '\n'.join(lines)):
+        counts[finding['code'][0]] = counts.get(finding['code'][0], 0) + 1
+
+    if counts["F"] or statements == 0:
+        return 0.0 if counts["F"] else 10.0
+    return max(0.0, 10.0 - (5 * counts["E"] + counts["W"] + counts["R"] + counts["C"]) / statements * 10)
+
+def _run_subprocess(command: list[str], timeout: float, cwd: str | None = None, stdin: str | None = None) -> ToolResult:
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            command,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=cwd
+        )
+        status, output = "ok", completed.stdout
+    except subprocess.TimeoutExpired:
+        status, output = "timeout", f"{command[0]} did not finish within {timeout:g}s"
+    except FileNotFoundError:
+        status, output = "missing", f"{command[0]} is not installed"
+    except OSError as e:
+        status, output = "error", f"{command[0]} failed to start: {e}"
+
+    return {"status": status, "output": output, "elapsed": time.perf_counter() - started}
+
+async def _arun_tool(command: list[str], timeout: float, cwd: str | None = None, stdin: str | None = None) -> ToolResult:
+    loop = asyncio.get_running_loop()
+    if loop not in _async_semaphores:
+        _async_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async with _async_semaphores[loop]:
+        if BACKEND == "worker":
+            return await loop.run_in_executor(_executor, _workers.run, command, timeout, cwd, stdin)
+
+        started = time.perf_counter()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd
+            )
+        except FileNotFoundError:
+            return {"status": "missing", "output": f"{command[0]} is not installed", "elapsed": time.perf_counter() - started}
+        except OSError as e:
+            return {"status": "error", "output": f"{command[0]} failed to start: {e}", "elapsed": time.perf_counter() - started}
+
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(stdin.encode("utf-8") if stdin is not None else None), timeout=timeout)
+            status, output = "ok", stdout.decode("utf-8", errors="replace")
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            status, output = "timeout", f"{command[0]} did not finish within {timeout:g}s"
+
+        return {"status": status, "output": output, "elapsed": time.perf_counter() - started}
@@ -0,0 +1,118 @@
+import io
+import os
+import time
+import uuid
+import asyncio
+import zipfile
+import posixpath
+from collections import Counter
+from .analyzer import arun_static_analysis_batch, build_report
+from .metrics import record_stage
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", str(os.cpu_count() or 4)))  # 동시에 리뷰하는 파일 수
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "200"))                         # 한 번에 리뷰 가능한 최대 파일 수
+BATCH_MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(512 * 1024)))     # 파일당 최대 크기
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+def normalize_path(path: str) -> str | None:
+    ''' normalize_path
+        업로드된 파일 경로를 작업 폴더 안의 상대 경로로 정규화 (폴더 밖을 가리키거나 .py 파일이 아니면 None)
+        I: 파일 경로 (String)
+        O: 정규화된 상대 경로 (String) 또는 None
+    '''
+    path = posixpath.normpath(path.replace("\\", "/")).lstrip("/")
+    if path.startswith("..") or not path.endswith(".py"):
+        return None
+
+    return path
+
+def extract_archive(data: bytes) -> dict[str, str]:
+    ''' extract_archive
+        zip 압축 파일에서 Python 파일만 꺼내서 반환
+        I: zip 파일 바이트 (Bytes)
+        O: 파일별 코드 (DICT<상대 경로(String): 코드(String)>)
+    '''
+    files = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            path = normalize_path(info.filename)
+            if info.is_dir() or path is None or info.file_size > BATCH_MAX_FILE_BYTES:
+                continue
+            files[path] = archive.read(info).decode("utf-8", errors="replace")
+
+    return files
+
+async def review_batch(graph, files: dict[str, str], save, slot, concurrency: int = BATCH_CONCURRENCY,
+                       review_mode: str = "full", severity_threshold: str | None = None) -> dict:
+    ''' review_batch
+        여러 파일을 한 번에 리뷰
+        정적 분석은 전체 파일에 대해 도구별로 한 번만 실행하고, 그래프 실행은 최대 concurrency개씩 병렬로 수행
+        파일마다 리뷰 ID를 부여하고 결과를 저장하므로, 파일별 결과를 base_review_id로 사용하여 증분 리뷰 가능
+        I: 컴파일된 CodeReviewGraph, 파일별 코드 (DICT<상대 경로(String): 코드(String)>),
+           리뷰 결과 저장 함수 (리뷰 ID, 그래프 출력 -> 저장된 리뷰 결과를 반환하는 코루틴),
+           실행 슬롯 함수 (파일마다 async with로 사용, 동시 리뷰 수 제한에 파일 단위로 포함), 동시 실행 수 (Int),
+           리뷰 모드 (String), 리팩토링 기준 심각도 (String)
+        O: 파일별 리뷰 결과와 요약 (DICT)
+    '''
+    started = time.perf_counter()
+    analysis = await arun_static_analysis_batch(files)
+    record_stage("batch_analysis", time.perf_counter() - started)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def review_file(path: str):
+        async with semaphore:
+            review_id = uuid.uuid4().hex
+            try:
+                async with slot():
+                    output = await graph.ainvoke(files[path], static_analysis=build_report(analysis[path]),
+                                                 review_mode=review_mode, severity_threshold=severity_threshold,
+                                                 review_id=review_id)
+                return {"path": path, "status": True, "result": await save(review_id, output)}
+            except Exception as e:
+                return {"path": path, "status": False, "error": str(e), "review_id": review_id}
+
+    results = await asyncio.gather(*[review_file(path) for path in files])
+
+    return {
+        "files": results,
+        "summary": summarize(results, time.perf_counter() - started)
+    }
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    ''' summarize
+        파일별 리뷰 결과를 집계
+        I: 파일별 리뷰 결과 (LIST<DICT>), 전체 소요 시간 (Float)
+        O: 파일 수, 실패 수, 심각도·유형별 이슈 수 등이 담긴 요약 (DICT)
+    '''
+    severity, issue_type = Counter(), Counter()
+    refactoring_issues = 0
+    for item in results:
+        if not item['status']:
+            continue
+        for issue in item['result'].get('issues') or []:
+            severity[issue.get('severity')] += 1
+            issue_type[issue.get('issue_type')] += 1
+        refactoring_issues += len(item['result'].get('refactoring_issues') or [])
+
+    return {
+        "files": len(results),
+        "reviewed": sum(1 for item in results if item['status']),
+        "failed": [item['path'] for item in results if not item['status']],
+        "issues": sum(severity.values()),
+        "issues_by_severity": dict(severity),
+        "issues_by_type": dict(issue_type),
+        "refactoring_issues": refactoring_issues,
+        "elapsed": elapsed,
+    }
\ No newline at end of file
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from cachetools import TTLCache
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+CACHE_SIZE = int(os.getenv("REVIEW_CACHE_SIZE", "1024"))                      # 메모리 계층 최대 항목 수
+CACHE_TTL = float(os.getenv("REVIEW_CACHE_TTL", str(24 * 60 * 60)))           # 항목 유효 시간(초)
+CACHE_PATH = os.getenv("REVIEW_CACHE_PATH", "")                               # 디스크(SQLite) 계층 경로, 비어 있으면 사용 안 함
+CACHE_MAX_BYTES = int(os.getenv("REVIEW_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 디스크 계층 최대 용량
+
+
+class ReviewCache:
+    ''' ReviewCache
+        정적 분석 리포트 및 LLM 노드 출력을 저장하는 2단계 캐시
+        - 메모리 계층: TTL이 적용된 LRU
+        - 디스크 계층(선택): SQLite, TTL 및 전체 용량 기준으로 오래 사용되지 않은 항목부터 제거
+    '''
+    def __init__(self, max_entries: int = CACHE_SIZE, ttl: float = CACHE_TTL,
+                 path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.path = path
+        self.max_bytes = max_bytes
+        self._memory = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+        if self.path:
+            with self._connect() as conn:
+                # 여러 서버 프로세스(uvicorn --workers)가 같은 파일을 공유하므로 WAL 모드로 읽기와 쓰기가 서로 막지 않도록 함
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                    "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+
+    def get(self, key: str):
+        ''' get
+            키에 해당하는 값을 메모리 → 디스크 순으로 조회 (디스크에서 찾은 값은 메모리로 승격)
+            I: 캐시 키 (String)
+            O: 저장된 값, 없거나 만료된 경우 None
+        '''
+        found, value = self._get_from_memory(key)
+        if found:
+            return value
+
+        return self._promote(key, self._get_from_disk(key) if self.path else None)
+
+    async def aget(self, key: str):
+        ''' aget
+            get의 비동기 버전 (디스크 계층 조회는 스레드에서 실행하여 잠긴 SQLite 파일을 기다리는 동안 이벤트 루프를 막지 않음)
+        '''
+        found, value = self._get_from_memory(key)
+        if found:
+            return value
+
+        return self._promote(key, await asyncio.to_thread(self._get_from_disk, key) if self.path else None)
+
+    def set(self, key: str, value):
+        ''' set
+            값을 메모리 및 디스크 계층에 저장
+            I: 캐시 키 (String), JSON 직렬화 가능한 값
+        '''
+        self._set_to_memory(key, value)
+        if self.path:
+            self._set_to_disk(key, value)
+
+    async def aset(self, key: str, value):
+        ''' aset
+            set의 비동기 버전 (디스크 계층 저장은 스레드에서 실행)
+        '''
+        self._set_to_memory(key, value)
+        if self.path:
+            await asyncio.to_thread(self._set_to_disk, key, value)
+
+    def stats(self) -> dict:
+        ''' stats
+            히트/미스 카운터 및 계층별 항목 수 반환
+        '''
+        with self._lock:
+            stats = dict(self._counters, memory_entries=len(self._memory))
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM cache")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_from_memory(self, key: str) -> tuple[bool, object]:
+        with self._lock:
+            if key in self._memory:
+                self._counters["memory_hits"] += 1
+                return True, self._memory[key]
+
+        return False, None
+
+    def _promote(self, key: str, value):
+        # 디스크 조회 결과를 집계하고, 찾은 값은 메모리 계층에 저장
+        with self._lock:
+            if value is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._memory[key] = value
+
+        return value
+
+    def _set_to_memory(self, key: str, value):
+        with self._lock:
+            self._memory[key] = value
+            self._counters["sets"] += 1
+
+    def _get_from_disk(self, key: str):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+
+        return json.loads(row[0])
+
+    def _set_to_disk(self, key: str, value):
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now + self.ttl, now)
+            )
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+
+            # 용량 초과 시 가장 오래 사용되지 않은 항목부터 제거
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total > self.max_bytes:
+                evicted = 0
+                rows = conn.execute("SELECT key, size FROM cache ORDER BY accessed_at").fetchall()
+                for old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM cache WHERE key = ?", (old_key,))
+                    total -= size
+                    evicted += 1
+                with self._lock:
+                    self._counters["evictions"] += evicted
+
+
+def make_key(namespace: str, *parts) -> str:
+    ''' make_key
+        입력 값들의 해시로 캐시 키 생성 (내용 기반 주소)
+        I: 캐시 구분자 (String), 키를 구성하는 JSON 직렬화 가능한 값들
+        O: "<구분자>:<sha256>" 형식의 키 (String)
+    '''
+    digest = hashlib.sha256(
+        json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
+    return f"{namespace}:{digest}"
+
+
+review_cache = ReviewCache()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import os
+from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+CHECKPOINT_PATH = os.getenv("REVIEW_CHECKPOINT_PATH", "")                      # SQLite 파일 경로, 비어 있으면 메모리에 저장
+CHECKPOINT_MAX_FAILED = int(os.getenv("REVIEW_CHECKPOINT_MAX_FAILED", "1000"))   # 재개를 위해 보관하는 실패한 리뷰 수 (초과 시 오래된 것부터 삭제)
+CHECKPOINT_TTL = float(os.getenv("REVIEW_CHECKPOINT_TTL", str(24 * 60 * 60)))      # 체크포인트 보관 시간(초, 이전 프로세스가 남긴 체크포인트도 시작 시 삭제)
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+@asynccontextmanager
+async def open_checkpointer(path: str = CHECKPOINT_PATH):
+    ''' open_checkpointer
+        그래프 실행 상태를 노드 단위로 저장하는 LangGraph 체크포인터 생성
+        path가 주어지면 SQLite 파일에 저장하여 서버가 재시작되어도 실패한 리뷰를 이어서 실행할 수 있음
+        I: SQLite 파일 경로 (String, 없으면 메모리)
+        O: 체크포인터 (async with 블록 안에서만 유효)
+    '''
+    if not path:
+        yield InMemorySaver()
+        return
+
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        # 실패 기록(CHECKPOINT_MAX_FAILED)은 프로세스별이므로, 이전 프로세스가 남긴 체크포인트는 보관 시간 기준으로 삭제
+        await prune_checkpoints(saver)
+        yield saver
+
+async def prune_checkpoints(checkpointer, ttl: float = CHECKPOINT_TTL) -> int:
+    ''' prune_checkpoints
+        마지막 체크포인트가 보관 시간보다 오래된 리뷰의 체크포인트를 모두 삭제
+        I: 체크포인터, 보관 시간(초)
+        O: 삭제한 리뷰 수 (Int)
+    '''
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+    latest = {}     # 리뷰 ID(thread_id) -> 마지막 체크포인트 시각
+    async for item in checkpointer.alist(None):
+        thread_id = item.config['configurable']['thread_id']
+        created_at = datetime.fromisoformat(item.checkpoint['ts'])
+        if thread_id not in latest or created_at > latest[thread_id]:
+            latest[thread_id] = created_at
+
+    expired = [thread_id for thread_id, created_at in latest.items() if created_at < cutoff]
+    for thread_id in expired:
+        await checkpointer.adelete_thread(thread_id)
+
+    return len(expired)
@@ -0,0 +1,86 @@
+import os
+import ast
+from typing import TypedDict
+from .incremental import top_level_blocks, in_ranges
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+# 코드가 이 줄 수를 넘으면 최상위 블록 단위로 나누어 병렬로 리뷰
+CHUNK_MAX_LINES = int(os.getenv("REVIEW_CHUNK_MAX_LINES", "300"))
+
+
+class CodeChunk(TypedDict):
+    code: str                       # 청크 코드 (리뷰 대상 줄과 import 등 문맥 줄만 남기고 나머지는 빈 줄, 줄 번호는 원본과 동일)
+    ranges: list[tuple[int, int]]   # 이 청크에서 리뷰하는 (시작 줄, 끝 줄) 목록
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+def split_code(code: str, max_lines: int = CHUNK_MAX_LINES) -> list[CodeChunk]:
+    ''' split_code
+        코드를 모듈 최상위 블록(함수, 클래스 등) 경계에서 max_lines 이하 크기의 청크로 분할
+        각 청크에는 모듈 수준의 import·대입문을 문맥으로 함께 포함하며, 줄 번호가 원본과 같도록 나머지 줄은 빈 줄로 채움
+        I: 문자열 형식의 파이썬 코드 (String), 청크당 최대 줄 수 (Int)
+        O: 청크 목록 (LIST<CodeChunk>), 나눌 필요가 없거나 파싱할 수 없으면 전체 코드 하나
+    '''
+    lines = code.splitlines()
+    whole = [{"code": code, "ranges": [(1, max(len(lines), 1))]}]
+    if len(lines) <= max_lines:
+        return whole
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return whole
+
+    # 최상위 블록을 순서대로 묶어서 청크 구성 (하나의 블록이 max_lines보다 크면 단독 청크)
+    groups, current = [], []
+    for start, end in top_level_blocks(code):
+        if current and end - current[0][0] + 1 > max_lines:
+            groups.append(current)
+            current = []
+        current.append((start, end))
+    if current:
+        groups.append(current)
+    if len(groups) <= 1:
+        return whole
+
+    context = set()
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.Assign, ast.AnnAssign)):
+            context.update(range(node.lineno, node.end_lineno + 1))
+
+    chunks = []
+    for group in groups:
+        ranges = [(group[0][0], group[-1][1])]
+        keep = context | set(range(ranges[0][0], ranges[0][1] + 1))
+        chunk_lines = [line if i + 1 in keep else "" for i, line in enumerate(lines[:ranges[0][1]])]
+        chunks.append({"code": "\n".join(chunk_lines) + "\n", "ranges": ranges})
+
+    return chunks
+
+def merge_issues(results: list[tuple[list[dict], list[tuple[int, int]]]]) -> list[dict]:
+    ''' merge_issues
+        청크별 이슈 목록을 합침 (청크의 리뷰 범위를 벗어난 이슈는 제외하고, 같은 위치·제목의 중복 이슈 제거)
+        I: (청크별 이슈 목록, 청크 리뷰 범위) 목록
+        O: 줄 번호 순으로 정렬된 이슈 목록 (LIST<CodeIssue>)
+    '''
+    merged, seen = [], set()
+    for issues, ranges in results:
+        for issue in issues:
+            if not in_ranges(issue.get('start_line'), issue.get('end_line'), ranges):
+                continue
+            key = (issue['start_line'], issue['end_line'], str(issue.get('title', '')).strip().lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(issue)
+
+    return sorted(merged, key=lambda issue: (issue['start_line'], issue['end_line']))
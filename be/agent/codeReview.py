@@ -1,14 +1,26 @@
-import json
-from dotenv import load_dotenv
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
 from typing import TypedDict, Literal
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import RetryPolicy
+import openai
 from langchain_openai import ChatOpenAI
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ensure_config, merge_configs
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-import subprocess
-import tempfile
 import os
+from .analyzer import (arun_static_analysis, build_report, filter_report, format_report,
+                       tool_versions, AnalysisReport)
+from .cache import review_cache, make_key
+from .incremental import plan_incremental, in_ranges
+from .chunking import split_code, merge_issues
+from .issues import IssueParseError, parse_issue_report
+from .checkpoint import InMemorySaver, CHECKPOINT_MAX_FAILED
+from .llm import get_llm, allm_slot, LLM_NODES
+from .metrics import timed_node, current_node, record_tool_results, record_cache, record_payload, token_usage_callback
 
 ''' 
 ====================
@@ -16,69 +28,182 @@ import os
 ====================
 '''
 
-# TODO: Pydantic 이용해서 데이터 유효성 검사 로직 추가
-class CodeIssue(TypedDict):
-    title: str
-    description: str
-    issue_type: str
-    severity: str
-    start_line: int
-    end_line: int
-    code_snippet: list[str]
+ReviewMode = Literal["full", "issues_only"]    # full: 이슈 추출 + 리팩토링 + 재분석 + 단위 테스트, issues_only: 이슈 추출만
+Severity = Literal["CRITICAL", "WARNING"]
+
+# 심각도 순위 (값이 클수록 심각)
+SEVERITY_LEVELS = {"WARNING": 1, "CRITICAL": 2}
 
 # State schema
 class CodeReviewState(TypedDict):
     user_code: str
+    review_mode: ReviewMode
+    severity_threshold: Severity    # 이 심각도 이상의 이슈가 있을 때만 리팩토링 및 재분석 수행
+    base_review: dict               # 증분 리뷰 시 이전 리뷰 결과 {"code", "issues", "pylint_score"} (변경된 블록만 다시 리뷰)
+    static_analysis: AnalysisReport # 미리 계산된 사용자 코드의 정적 분석 결과 (배치 리뷰 시 사용, 없으면 노드에서 분석)
     refactoring_code: str
-    issues: CodeIssue
-    refactoring_issues: CodeIssue
+    issues: list[dict]              # 검증된 CodeIssue를 dict로 변환한 목록 (CodeIssue.model_dump())
+    refactoring_issues: list[dict]
     pylint_score: str
     refactoring_pylint_score: str
     unit_code: str
 
 
+# 토큰 단위 스트리밍을 지원하는 노드 (리팩토링 코드 생성)
+TOKEN_STREAMING_NODES = {"suggest_code_improvements"}
+
+# 일시적인 LLM API 오류(연결, 시간 초과, 요청 한도, 서버 오류)는 실패한 노드만 지수 백오프로 재시도
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+TRANSIENT_LLM_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+NODE_RETRY_POLICY = RetryPolicy(max_attempts=LLM_MAX_ATTEMPTS, retry_on=TRANSIENT_LLM_ERRORS)
+
+
 class CodeReviewGraph:
-    def __init__(self):
+    def __init__(self, checkpointer=None):
         builder = StateGraph(CodeReviewState)
 
         # Add Nodes
-        builder.add_node("extract_code_issues", extract_code_issues)
-        builder.add_node("suggest_code_improvements", suggest_code_improvements)
-        builder.add_node("generate_unit_tests", generate_unit_tests)
+        # 노드는 비동기 함수로만 구현 (LLM 호출과 정적 분석이 이벤트 루프를 막지 않음)
+        builder.add_node("extract_code_issues", aextract_code_issues, retry_policy=NODE_RETRY_POLICY)
+        builder.add_node("suggest_code_improvements", asuggest_code_improvements, retry_policy=NODE_RETRY_POLICY)
+        builder.add_node("extract_refactoring_issues", aextract_refactoring_issues, retry_policy=NODE_RETRY_POLICY)
+        builder.add_node("generate_unit_tests", agenerate_unit_tests, retry_policy=NODE_RETRY_POLICY)
 
         # Add Edges
+        # 이슈 추출 후 라우팅 정책(_decide_next_step)에 따라 리팩토링, 단위 테스트 생성 또는 종료로 분기
+        # 리팩토링 코드의 재분석과 단위 테스트 생성은 서로 독립적이므로 병렬로 실행(fan-out)
         builder.add_edge(START, "extract_code_issues")
-        builder.add_conditional_edges(
-            "extract_code_issues",
-            self._decide_next_step,
-            {
-                "suggest_code_improvements": "suggest_code_improvements",
-                "generate_unit_tests": "generate_unit_tests"
-            }
-        )
-        builder.add_edge("suggest_code_improvements", "extract_code_issues")
+        builder.add_conditional_edges("extract_code_issues", _decide_next_step,
+                                      ["suggest_code_improvements", "generate_unit_tests", END])
+        builder.add_edge("suggest_code_improvements", "extract_refactoring_issues")
+        builder.add_edge("suggest_code_improvements", "generate_unit_tests")
+        builder.add_edge("extract_refactoring_issues", END)
         builder.add_edge("generate_unit_tests", END)
 
         # Compile
-        self.graph = builder.compile()
-
-        # Save Graph Image
-        image_bytes = self.graph.get_graph().draw_mermaid_png()
-        with open("docs/graph_output.png", "wb") as f:
+        # 노드가 끝날 때마다 상태를 체크포인터에 저장 (thread_id = 리뷰 ID)
+        # 실패한 리뷰는 resume으로 마지막으로 완료된 노드 이후부터 이어서 실행하고, 완료된 리뷰의 체크포인트는 삭제
+        self.checkpointer = checkpointer or InMemorySaver()
+        self.graph = builder.compile(checkpointer=self.checkpointer)
+        self._failed = OrderedDict()    # 재개를 위해 체크포인트를 남겨 둔 실패한 리뷰 ID
+
+    def draw_png(self) -> bytes:
+        ''' draw_png
+            컴파일된 그래프를 Mermaid PNG 이미지로 렌더링 (원격 렌더러 호출이 필요하므로 요청 시에만 수행)
+            O: PNG 이미지 바이트 (Bytes)
+        '''
+        return self.graph.get_graph().draw_mermaid_png()
+
+    def save_image(self, path: str = "docs/graph_output.png"):
+        ''' save_image
+            그래프 시각화 이미지를 파일로 저장
+            I: 저장할 파일 경로 (String)
+        '''
+        image_bytes = self.draw_png()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
             f.write(image_bytes)
+        os.replace(tmp_path, path)
     
-    def _decide_next_step(self, state: CodeReviewState) -> Literal["suggest_code_improvements", "generate_unit_tests"]:
-        if not state.get('refactoring_code', False):
-            return "suggest_code_improvements"  
-        else:
-            return "generate_unit_tests"
+    def invoke(self, query, static_analysis: AnalysisReport | None = None,
+               review_mode: ReviewMode = "full", severity_threshold: Severity | None = None,
+               base_review: dict | None = None, review_id: str | None = None):
+        ''' invoke
+            ainvoke를 새 이벤트 루프에서 실행하는 동기 버전 (스크립트 등 이벤트 루프 밖에서 사용)
+        '''
+        return asyncio.run(self.ainvoke(query, static_analysis, review_mode, severity_threshold, base_review, review_id))
+
+    async def ainvoke(self, query, static_analysis: AnalysisReport | None = None,
+                      review_mode: ReviewMode = "full", severity_threshold: Severity | None = None,
+                      base_review: dict | None = None, review_id: str | None = None):
+        initial_state = self._initial_state(query, static_analysis, review_mode, severity_threshold, base_review)
+        output = await self._arun(initial_state, review_id or uuid.uuid4().hex)
+
+        return output
 
-    def invoke(self, query):
-        initial_state = {'user_code': query}
-        output = self.graph.invoke(initial_state) 
+    async def aresume(self, review_id: str):
+        ''' aresume
+            실패한 리뷰를 마지막으로 완료된 노드 이후부터 이어서 실행 (완료된 노드는 다시 실행하지 않음)
+            I: 리뷰 ID (String)
+            O: 최종 상태 (DICT), 재개할 체크포인트가 없으면 None
+        '''
+        if (await self.graph.aget_state(_thread_config(review_id))).created_at is None:
+            return None
+
+        return await self._arun(None, review_id)
+
+    async def _arun(self, graph_input, review_id: str):
+        # 취소·중단된 실행(BaseException)도 실패로 기록하여 체크포인트가 보관 개수 제한에서 빠지지 않도록 함
+        try:
+            output = await self.graph.ainvoke(graph_input, _thread_config(review_id))
+        except BaseException:
+            for expired in self._remember_failed(review_id):
+                await self.checkpointer.adelete_thread(expired)
+            raise
+        self._failed.pop(review_id, None)
+        await self.checkpointer.adelete_thread(review_id)
 
         return output
 
+    def _remember_failed(self, review_id: str) -> list[str]:
+        # 실패한 리뷰 ID를 기록하고, 보관 개수를 넘긴 오래된 리뷰 ID 목록을 반환 (체크포인트 삭제 대상)
+        self._failed[review_id] = time.time()
+        self._failed.move_to_end(review_id)
+        expired = []
+        while len(self._failed) > CHECKPOINT_MAX_FAILED:
+            expired.append(self._failed.popitem(last=False)[0])
+
+        return expired
+
+    def _initial_state(self, query, static_analysis: AnalysisReport | None = None,
+                       review_mode: ReviewMode = "full", severity_threshold: Severity | None = None,
+                       base_review: dict | None = None) -> CodeReviewState:
+        initial_state = {
+            'user_code': query,
+            'review_mode': review_mode,
+            'severity_threshold': severity_threshold or REVIEW_SEVERITY_THRESHOLD,
+        }
+        if static_analysis is not None:
+            initial_state['static_analysis'] = static_analysis
+        if base_review is not None:
+            initial_state['base_review'] = base_review
+
+        return initial_state
+
+    async def astream(self, query, tokens: bool = False,
+                      review_mode: ReviewMode = "full", severity_threshold: Severity | None = None,
+                      base_review: dict | None = None, review_id: str | None = None):
+        ''' astream
+            노드가 끝날 때마다 해당 노드의 상태 변경분을 이벤트로 전달
+            tokens=True 이면 리팩토링 코드 생성 중 LLM 토큰도 함께 전달
+            I: 사용자 코드 (String), 토큰 스트리밍 여부 (Bool), 리뷰 모드, 리팩토링 기준 심각도, 이전 리뷰 결과 (증분 리뷰 시),
+               리뷰 ID (String, 체크포인트 thread_id)
+            O: {"event": "update", "node": 노드명, "data": 상태 변경분} 또는
+               {"event": "token", "node": 노드명, "data": 토큰 문자열} 형태의 이벤트 (비동기 제너레이터)
+        '''
+        initial_state = self._initial_state(query, review_mode=review_mode, severity_threshold=severity_threshold,
+                                            base_review=base_review)
+        stream_mode = ["updates", "messages"] if tokens else ["updates"]
+        review_id = review_id or uuid.uuid4().hex
+
+        try:
+            async for mode, chunk in self.graph.astream(initial_state, _thread_config(review_id), stream_mode=stream_mode):
+                if mode == "updates":
+                    for node, update in chunk.items():
+                        yield {"event": "update", "node": node, "data": update or {}}
+                else:
+                    message, metadata = chunk
+                    node = metadata.get("langgraph_node")
+                    if node in TOKEN_STREAMING_NODES and message.content:
+                        yield {"event": "token", "node": node, "data": message.content}
+        except BaseException:
+            # 클라이언트 연결 종료(GeneratorExit)·취소(CancelledError)로 중단된 스트림도 실패로 기록 (재개 가능)
+            for expired in self._remember_failed(review_id):
+                await self.checkpointer.adelete_thread(expired)
+            raise
+        self._failed.pop(review_id, None)
+        await self.checkpointer.adelete_thread(review_id)
+
     
 ''' 
 ====================
@@ -86,11 +211,15 @@ class CodeReviewGraph:
 ====================
 '''
 
-load_dotenv()
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# 노드별 채팅 모델은 llm.py에서 설정 (LLM_<노드명>_MODEL 등)
+# LLM 응답이 올바른 JSON이 아닐 때 응답 수정을 요청하는 최대 횟수 및 첫 대기 시간(초, 매번 2배)
+LLM_REPAIR_ATTEMPTS = int(os.getenv("LLM_REPAIR_ATTEMPTS", "2"))
+LLM_REPAIR_BACKOFF = float(os.getenv("LLM_REPAIR_BACKOFF", "0.5"))
+
+# 요청에서 지정하지 않았을 때 리팩토링을 수행할 최소 심각도 (CRITICAL 이면 WARNING 이슈만 있는 코드는 리팩토링 생략)
+REVIEW_SEVERITY_THRESHOLD = os.getenv("REVIEW_SEVERITY_THRESHOLD", "CRITICAL")
 
-def extract_code_issues(state: CodeReviewState) -> CodeReviewState:
-    template = """
+EXTRACT_CODE_ISSUES_TEMPLATE = """
     You are an expert-level Python code reviewer specializing in bugs, security, and performance issues.
     Your task is to analyze the given Python code and identify meaningful issues that could impact correctness, security, or efficiency.
     Focus only on meaningful and important issues (not style or general improvements), but be thorough and list **as many such issues as possible** throughout the entire code.
@@ -122,18 +251,9 @@ def extract_code_issues(state: CodeReviewState) -> CodeReviewState:
         - You must ensure the snippet content and line numbers exactly match the original code** — validate both the content and the position against the provided source code.
 
     Your output must follow this format (strict JSON only, no markdown or explanation):
-    If there are no issues, return an empty JSON array: []
-    
-    Here is the code to analyze:
-
-    {code}
-
-    And here is the static analysis result:
-
-    {static_analysis}
+    If there are no issues, return an empty "issues" array: {{"pylint_score": ..., "issues": []}}
 
-    ---
-    Return your result as a JSON array containing all detected issues.
+    Return your result as a JSON object containing all detected issues.
     ```json
     {{
     "pylint_score": float or null,
@@ -150,43 +270,22 @@ def extract_code_issues(state: CodeReviewState) -> CodeReviewState:
         ...
     ]
     }}
-    """
-    prompt = ChatPromptTemplate.from_template(template)
-
-    rag_chain = (
-        RunnablePassthrough()
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-    if not state.get('issues', False):
-        static_analysis = _analyze_code(state['user_code'])
-        
-        output = rag_chain.invoke({"code": state['user_code'], 'static_analysis': static_analysis})
-
-        # 결과 후처리
-        result = _remove_markdown_code_tag(output)
-        result = json.loads(result)
 
-        # Update states
-        return {"issues": result['issues'], "pylint_score": result['pylint_score']}
+    The user message contains the code to analyze, followed by the condensed static analysis findings
+    (one line per finding: "line numbers: tool code message").
+    """
 
-    if state.get('refactoring_code', False) and not state.get('refactoring_issues', False):
-        static_analysis = _analyze_code(state['refactoring_code'])
+EXTRACT_CODE_ISSUES_INPUT = """
+    Here is the code to analyze:
 
-        output = rag_chain.invoke({"code": state['refactoring_code'], 'static_analysis': static_analysis})
-        
-        # 결과 후처리
-        result = _remove_markdown_code_tag(output)
-        result = json.loads(result)
+    {code}
 
-        # Update states
-        return {"refactoring_issues": result['issues'], "refactoring_pylint_score": result['pylint_score']}
+    And here is the static analysis result:
 
-    
+    {static_analysis}
+    """
 
-def suggest_code_improvements(state: CodeReviewState) -> CodeReviewState:
-    template = """
+SUGGEST_CODE_IMPROVEMENTS_TEMPLATE = """
     You are given a Python code snippet under the field user_code, and a list of detected issues under the field issues.
     Each issue includes:
     - "title": a short and concise summary of the issue (e.g., "Contains SQL injection vulnerability")
@@ -204,7 +303,9 @@ def suggest_code_improvements(state: CodeReviewState) -> CodeReviewState:
     For every modified line, append a Python comment containing the corresponding issue title (e.g., # Fixed: Potential index out of range error).
 
     Do not include any explanation or extra output—only return the full corrected Python code with inline comments.
+    """
 
+SUGGEST_CODE_IMPROVEMENTS_INPUT = """
     [user_code]
     {user_code}
 
@@ -212,21 +313,21 @@ def suggest_code_improvements(state: CodeReviewState) -> CodeReviewState:
     {issues}
     """
 
-    prompt = ChatPromptTemplate.from_template(template)
+REPAIR_ISSUES_TEMPLATE = """
+    A previous code review response could not be parsed as the required JSON object.
+    Return the same issues as a single valid JSON object with the fields "pylint_score" and "issues"
+    (strict JSON only, no markdown or explanation). Each issue must have "title", "description", "issue_type",
+    "severity", "start_line", "end_line" and "code_snippet".
+    """
 
-    rag_chain = (
-        RunnablePassthrough()
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-    output = rag_chain.invoke({"user_code": state['user_code'], 'issues': state['issues']})
-    result = _remove_markdown_code_tag(output)
+REPAIR_ISSUES_INPUT = """
+    Error: {error}
 
-    return {'refactoring_code': result}
+    Previous response:
+    {output}
+    """
 
-def generate_unit_tests(state: CodeReviewState) -> CodeReviewState:
-    template = '''
+GENERATE_UNIT_TESTS_TEMPLATE = '''
     You are given a Python code snippet under the field code. Your task is to:
 
     1. Generate unittest-style test cases for the given code using Python's built-in unittest module.
@@ -255,25 +356,64 @@ def generate_unit_tests(state: CodeReviewState) -> CodeReviewState:
             if self.validate_credentials():
                 return f"token_{{self.username}}_{{len(self.password)}}"
             return None
-    
+    '''
+
+GENERATE_UNIT_TESTS_INPUT = '''
     Input:
     {code}
     '''
 
-    prompt = ChatPromptTemplate.from_template(template)
+# 노드별 프롬프트 (system: 고정 지시문, human: 코드 등 요청마다 달라지는 입력)
+# 고정 지시문을 항상 같은 접두부로 보내 접두부 캐시를 지원하는 서버(예: LLM_BASE_URL로 지정한 vLLM 등)에서 재사용되도록 하고,
+# 프롬프트 템플릿은 import 시 한 번만 생성
+# 단, OpenAI API의 프롬프트 캐시는 1024 토큰 이상 같은 접두부에만 적용되는데 가장 긴 고정 지시문(EXTRACT_CODE_ISSUES_TEMPLATE)도
+# 약 800~900 토큰이므로 코드가 다른 요청 사이에는 적용되지 않음 (review_llm_cached_token_ratio는 0으로 유지됨)
+PROMPT_MESSAGES = {
+    "extract_code_issues": (EXTRACT_CODE_ISSUES_TEMPLATE, EXTRACT_CODE_ISSUES_INPUT),
+    "repair_issues": (REPAIR_ISSUES_TEMPLATE, REPAIR_ISSUES_INPUT),
+    "suggest_code_improvements": (SUGGEST_CODE_IMPROVEMENTS_TEMPLATE, SUGGEST_CODE_IMPROVEMENTS_INPUT),
+    "generate_unit_tests": (GENERATE_UNIT_TESTS_TEMPLATE, GENERATE_UNIT_TESTS_INPUT),
+}
+PROMPTS = {
+    name: ChatPromptTemplate.from_messages([("system", system), ("human", human)])
+    for name, (system, human) in PROMPT_MESSAGES.items()
+}
+# JSON 형식으로 응답해야 하는 프롬프트
+JSON_PROMPTS = {"extract_code_issues", "repair_issues"}
+# (프롬프트 이름, 모델 id) -> (모델, 체인), 모델마다 처음 사용할 때 한 번만 구성
+_chains = {}
+
+@timed_node("extract_code_issues")
+async def aextract_code_issues(state: CodeReviewState) -> CodeReviewState:
+    result = await _aextract_incremental_issues(state['user_code'], state['base_review']) if state.get('base_review') else None
+    issues, pylint_score = result or await _aextract_issues(state['user_code'], state.get('static_analysis'))
+
+    # Update states
+    return {"issues": issues, "pylint_score": pylint_score}
+
+@timed_node("extract_refactoring_issues")
+async def aextract_refactoring_issues(state: CodeReviewState) -> CodeReviewState:
+    issues, pylint_score = await _aextract_issues(state['refactoring_code'])
+
+    # Update states
+    return {"refactoring_issues": issues, "refactoring_pylint_score": pylint_score}
+
+@timed_node("suggest_code_improvements")
+async def asuggest_code_improvements(state: CodeReviewState) -> CodeReviewState:
+    output = await _ainvoke_chain("suggest_code_improvements", {"user_code": state['user_code'], 'issues': state['issues']})
+    result = _remove_markdown_code_tag(output)
+
+    return {'refactoring_code': result}
 
-    rag_chain = (
-        RunnablePassthrough()
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-    output = rag_chain.invoke({"code": state['refactoring_code']})
+@timed_node("generate_unit_tests")
+async def agenerate_unit_tests(state: CodeReviewState) -> CodeReviewState:
+    # 리팩토링을 생략한 경우 사용자 코드에 대한 테스트 생성
+    output = await _ainvoke_chain("generate_unit_tests", {"code": state.get('refactoring_code') or state['user_code']})
     result = _remove_markdown_code_tag(output)
 
     return {'unit_code': result}
-        
-        
+
+
 
 ''' 
 ====================
@@ -281,61 +421,212 @@ def generate_unit_tests(state: CodeReviewState) -> CodeReviewState:
 ====================
 '''
 
-def _analyze_code(code: str) -> dict:
-    ''' _analyze_code
-        주어진 Python 코드 문자열을 임시 파일에 저장한 후, Pylint, Flake8, Bandit, MyPy를 실행하여 결과 반환
-        I: 문자열 형식의 파이썬 코드 (String)
-        O: 정적 도구(pylint, flake8, bandit, mypy) 별 분석 결과가 담긴 딕셔너리 (DICT<도구명(String): 분석 결과(String)>)
+def warm_up():
+    ''' warm_up
+        첫 요청이 부담하던 준비 작업을 미리 수행 (서버 시작 시 호출)
+        - 정적 분석 도구 버전 조회 (캐시 키 구성에 사용, 도구마다 프로세스를 실행하므로 수 초 소요)
+        - 노드별 채팅 모델(공유 HTTP 클라이언트 포함) 생성 및 프롬프트 체인 구성
     '''
-    """"""
-    results = {}
+    tool_versions()
+    for node in LLM_NODES:
+        llm = get_llm(node)
+        for prompt in PROMPTS:
+            _get_chain(prompt, llm)
+
+def _thread_config(review_id: str) -> dict:
+    # 체크포인트는 리뷰 ID를 thread_id로 사용하여 저장·조회
+    return {"configurable": {"thread_id": review_id}}
+
+def _decide_next_step(state: CodeReviewState) -> str:
+    ''' _decide_next_step
+        이슈 추출 이후 실행할 노드를 결정하는 라우팅 정책
+        - issues_only 모드: 종료
+        - 기준 심각도 이상의 이슈가 있음: 리팩토링 (이후 재분석 및 단위 테스트)
+        - 없음: 리팩토링·재분석을 생략하고 사용자 코드에 대한 단위 테스트만 생성
+        I: 그래프 상태 (CodeReviewState)
+        O: 다음 노드명 (String)
+    '''
+    if state.get('review_mode') == "issues_only":
+        return END
+
+    threshold = SEVERITY_LEVELS.get(state.get('severity_threshold') or REVIEW_SEVERITY_THRESHOLD, SEVERITY_LEVELS["CRITICAL"])
+    # 알 수 없는 심각도는 놓치지 않도록 CRITICAL로 취급
+    actionable = [issue for issue in state.get('issues') or []
+                  if SEVERITY_LEVELS.get(str(issue.get('severity', '')).upper(), SEVERITY_LEVELS["CRITICAL"]) >= threshold]
+    if actionable:
+        return "suggest_code_improvements"
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".py", mode='w') as tmp:
-        tmp.write(code)
-        tmp_path = tmp.name
+    return "generate_unit_tests"
 
+async def _aanalyze_code(code: str) -> AnalysisReport:
+    ''' _aanalyze_code
+        주어진 Python 코드 문자열에 대해 Pylint, Flake8, Bandit, MyPy를 병렬로 실행하여 결과 반환
+        I: 문자열 형식의 파이썬 코드 (String)
+        O: 정적 도구(pylint, flake8, bandit, mypy)의 분석 결과를 합친 구조화된 리포트 (AnalysisReport)
+    '''
+    key = make_key("findings", tool_versions(), code)
+    cached = await review_cache.aget(key)
+    record_cache("analysis", cached is not None)
+    if cached is not None:
+        return cached
+
+    results = await arun_static_analysis(code)
+    record_tool_results(results)
+    report = build_report(results)
+
+    # 일부 도구가 실패한 부분 리포트는 캐시하지 않음
+    if not report['failed']:
+        await review_cache.aset(key, report)
+
+    return report
+
+async def _aextract_issues(code: str, static_analysis: AnalysisReport | None = None):
+    ''' _aextract_issues
+        정적 분석 결과와 함께 코드를 LLM에 전달하여 이슈 목록과 pylint 점수를 추출
+        코드가 길면 최상위 블록 단위 청크로 나누어 병렬로 추출한 뒤 합침 (청크마다 해당 범위의 분석 결과만 전달)
+        I: 문자열 형식의 파이썬 코드 (String), 미리 계산된 정적 분석 결과 (AnalysisReport, 없으면 새로 분석)
+        O: (이슈 목록, pylint 점수) 튜플
+    '''
+    if static_analysis is None:
+        static_analysis = await _aanalyze_code(code)
+
+    chunks = split_code(code)
+    if len(chunks) == 1:
+        issues, pylint_score = await _arequest_issues(code, format_report(static_analysis))
+        return issues, _pylint_score(static_analysis, pylint_score)
+
+    results = await asyncio.gather(*[
+        _arequest_issues(chunk['code'], format_report(filter_report(static_analysis, chunk['ranges'])))
+        for chunk in chunks
+    ])
+
+    issues, pylint_score = _merge_chunk_results(chunks, results)
+    return issues, _pylint_score(static_analysis, pylint_score)
+
+async def _arequest_issues(code: str, static_analysis: str):
+    ''' _arequest_issues
+        LLM으로 이슈를 추출하고 응답을 검증 (parse_issue_report)
+        응답을 해석할 수 없으면 코드 전체를 다시 보내지 않고 이전 응답의 수정만 요청 (최대 LLM_REPAIR_ATTEMPTS회, 지수 백오프)
+        I: 문자열 형식의 파이썬 코드 (String), 정적 분석 리포트 (String)
+        O: (이슈 목록, pylint 점수) 튜플
+    '''
+    parse = lambda output: parse_issue_report(output, code)
     try:
-        # Pylint
-        pylint_out = subprocess.run(
-            ["pylint", tmp_path, "--disable=all", "--enable=E,W,C,R"], # E: Error, W: Warning, C: Convention, R: Refactor
-            capture_output=True,
-            text=True
-        )
-        results["pylint"] = pylint_out.stdout
-
-        # Flake8
-        flake8_out = subprocess.run(
-            ["flake8", tmp_path],
-            capture_output=True,
-            text=True
-        )
-        results["flake8"] = flake8_out.stdout
-
-        # Bandit
-        bandit_out = subprocess.run(
-            ["bandit", "-r", tmp_path, "-q", "-n", "5"],
-            capture_output=True,
-            text=True
-        )
-        results["bandit"] = bandit_out.stdout
-
-        # MyPy
-        mypy_out = subprocess.run(
-            ["mypy", tmp_path],
-            capture_output=True,
-            text=True
-        )
-        results["mypy"] = mypy_out.stdout
-
-    finally:
-        os.remove(tmp_path)
-
-    # 문자열 형태로 변환
-    str_results = ''
-    for tool, output in results.items():
-        str_results = str_results + f"\n== {tool.upper()} REPORT ==" + '\n' + output.strip() + '\n'
-
-    return str_results
+        return await _ainvoke_chain("extract_code_issues", {"code": code, 'static_analysis': static_analysis}, parse=parse)
+    except IssueParseError as e:
+        error = e
+
+    for attempt in range(LLM_REPAIR_ATTEMPTS):
+        await asyncio.sleep(LLM_REPAIR_BACKOFF * 2 ** attempt)
+        try:
+            return await _ainvoke_chain("repair_issues", {"output": error.output, "error": str(error)}, parse=parse)
+        except IssueParseError as e:
+            error = e
+
+    raise error
+
+def _pylint_score(static_analysis: AnalysisReport, llm_score):
+    # pylint 출력에서 직접 읽은 점수를 우선 사용하고, 없을 때만 LLM이 추출한 값 사용
+    if static_analysis['pylint_score'] is not None:
+        return static_analysis['pylint_score']
+
+    return llm_score
+
+def _merge_chunk_results(chunks: list, results: list):
+    # 청크마다 같은 전체 리포트의 pylint 점수를 보므로 처음 추출된 값을 사용
+    issues = merge_issues([(chunk_issues, chunk['ranges']) for chunk, (chunk_issues, _) in zip(chunks, results)])
+    pylint_score = next((score for _, score in results if score is not None), None)
+
+    return issues, pylint_score
+
+async def _aextract_incremental_issues(code: str, base_review: dict):
+    ''' _aextract_incremental_issues
+        이전 리뷰 이후 변경된 최상위 블록(함수, 클래스 등)만 LLM에 다시 전달하여 이슈를 추출하고,
+        변경되지 않은 영역의 이전 이슈는 줄 번호만 옮겨서 유지
+        I: 문자열 형식의 파이썬 코드 (String), 이전 리뷰 결과 {"code", "issues", "pylint_score"} (DICT)
+        O: (이슈 목록, pylint 점수) 튜플, 증분 리뷰가 불가능하면(문법 오류, 큰 변경) None
+    '''
+    plan = plan_incremental(base_review['code'], base_review.get('issues') or [], code)
+    if plan is None:
+        return None
+    if not plan['changed']:
+        return plan['carried_issues'], base_review.get('pylint_score')
+
+    # 정적 분석은 파일 전체 기준으로 수행하고(수정된 코드는 분석 캐시에 없으므로 전체 리뷰와 같은 비용), 리포트와 코드는 변경된 블록 위주로 줄여서 전달
+    # 변경된 블록만 따로 분석하면 import·다른 블록의 정의가 빠져 잘못된 결과가 나오므로, 줄어드는 것은 LLM 입력과 호출 비용
+    static_analysis = filter_report(await _aanalyze_code(code), plan['changed'])
+    issues, pylint_score = await _aextract_issues(plan['skeleton'], static_analysis)
+    issues = [issue for issue in issues if in_ranges(issue.get('start_line'), issue.get('end_line'), plan['changed'])]
+
+    return plan['carried_issues'] + issues, pylint_score
+
+def _llm_identity(llm) -> tuple:
+    # 캐시 키에 사용할 모델 식별 정보 (모델 종류·이름·서버 주소·temperature·최대 토큰 수)
+    return (type(llm).__name__, getattr(llm, "model_name", None), getattr(llm, "openai_api_base", None),
+            getattr(llm, "temperature", None), getattr(llm, "max_tokens", None))
+
+def _get_chain(prompt: str, llm):
+    ''' _get_chain
+        프롬프트와 모델로 구성된 체인을 반환 (모델별로 한 번만 구성하여 재사용)
+        I: 프롬프트 이름 (String, PROMPTS의 키), LangChain 채팅 모델
+        O: 입력 값(DICT)을 받아 LLM 출력(String)을 반환하는 체인
+    '''
+    key = (prompt, id(llm))
+    entry = _chains.get(key)
+    if entry is not None and entry[0] is llm:
+        return entry[1]
+
+    model = llm
+    if prompt in JSON_PROMPTS and isinstance(llm, ChatOpenAI):
+        # OpenAI JSON mode: 응답이 항상 하나의 JSON 객체가 되도록 강제
+        model = llm.bind(response_format={"type": "json_object"})
+    chain = PROMPTS[prompt] | model | StrOutputParser()
+    _chains[key] = (llm, chain)
+
+    return chain
+
+async def _ainvoke_chain(prompt: str, inputs: dict, parse=None):
+    ''' _ainvoke_chain
+        현재 노드에 설정된 모델로 프롬프트를 실행
+        동일한 프롬프트·모델·입력에 대한 LLM 출력은 캐시에서 반환하고, 없으면 체인을 실행하여 저장
+        parse가 주어지면 파싱된 결과를 반환하며, 파싱에 성공한 출력만 캐시에 저장
+        I: 프롬프트 이름 (String, PROMPTS의 키), 프롬프트 입력 값 (DICT), 출력 파싱 함수
+        O: LLM 출력 (String) 또는 parse(LLM 출력) - 파싱 실패 시 IssueParseError (output 속성에 LLM 출력)
+    '''
+    node = current_node()
+    llm = get_llm(node)
+    key = make_key("llm", *_llm_identity(llm), PROMPT_MESSAGES[prompt], inputs)
+    cached = await review_cache.aget(key)
+    record_cache("llm", cached is not None)
+    if cached is not None:
+        return parse(cached) if parse else cached
+
+    async with allm_slot(node):
+        output = await _get_chain(prompt, llm).ainvoke(inputs, config=_chain_config())
+    record_payload("llm_output", len(output.encode("utf-8")))
+
+    result = _parse_output(output, parse)
+    await review_cache.aset(key, output)
+
+    return result
+
+def _chain_config() -> RunnableConfig:
+    # 노드에서 물려받은 설정(LangGraph 스트리밍 핸들러 포함)에 토큰 사용량 집계 핸들러를 추가
+    # (callbacks를 새로 지정하면 상위 핸들러가 사라져 tokens=true 스트리밍의 token 이벤트가 전달되지 않음)
+    config = ensure_config()
+    config.pop("run_name", None)
+
+    return merge_configs(config, {"callbacks": [token_usage_callback]})
+
+def _parse_output(output: str, parse=None):
+    # 파싱에 실패하면 IssueParseError의 output 속성에 LLM 출력을 담아 다시 발생 (캐시에 저장하지 않음)
+    if parse is None:
+        return output
+    try:
+        return parse(output)
+    except IssueParseError as e:
+        e.output = output
+        raise
 
 def _remove_markdown_code_tag(code: str):
     output = code.strip()
@@ -346,4 +637,12 @@ def _remove_markdown_code_tag(code: str):
     if output.endswith("```"):
         output = output[:-len('```')]
     
-    return output.strip()
\ No newline at end of file
+    return output.strip()
+
+
+if __name__ == "__main__":
+    # 그래프 시각화 이미지 생성: python -m be.agent.codeReview [저장 경로]
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else "docs/graph_output.png"
+    CodeReviewGraph().save_image(path)
+    print(f"Saved graph image to {path}")
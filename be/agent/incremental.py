@@ -0,0 +1,132 @@
+import os
+import ast
+import difflib
+from typing import TypedDict
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+# 변경된 줄 비율이 이 값을 넘으면 증분 리뷰 대신 전체 리뷰 수행
+INCREMENTAL_MAX_CHANGED_RATIO = float(os.getenv("INCREMENTAL_MAX_CHANGED_RATIO", "0.5"))
+
+
+class IncrementalPlan(TypedDict):
+    changed: list[tuple[int, int]]      # 다시 리뷰할 최상위 블록의 (시작 줄, 끝 줄) 목록 (새 코드 기준)
+    skeleton: str                       # 변경되지 않은 함수·클래스 본문을 생략한 새 코드 (줄 번호는 그대로 유지)
+    carried_issues: list[dict]          # 변경되지 않은 영역의 이전 이슈 (새 코드 기준 줄 번호로 이동)
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+def top_level_blocks(code: str) -> list[tuple[int, int]]:
+    ''' top_level_blocks
+        모듈 최상위 문장(함수, 클래스, import, 대입 등)별 줄 범위를 반환 (데코레이터 포함)
+        I: 문자열 형식의 파이썬 코드 (String)
+        O: (시작 줄, 끝 줄) 목록 (LIST<Tuple>), 1부터 시작하며 끝 줄 포함 - 문법 오류 시 SyntaxError 발생
+    '''
+    blocks = []
+    for node in ast.parse(code).body:
+        start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+        blocks.append((start, node.end_lineno))
+
+    return blocks
+
+def map_lines(old_code: str, new_code: str) -> tuple[dict[int, int], set[int]]:
+    ''' map_lines
+        두 코드의 줄 단위 diff를 계산
+        I: 이전 코드 (String), 새 코드 (String)
+        O: (변경되지 않은 줄의 이전 줄 번호 -> 새 줄 번호 매핑, 새 코드에서 추가·수정되었거나 삭제 위치에 인접한 줄 번호 집합)
+    '''
+    old_lines, new_lines = old_code.splitlines(), new_code.splitlines()
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+    line_map, touched = {}, set()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            line_map.update({i1 + k + 1: j1 + k + 1 for k in range(i2 - i1)})
+        elif j1 == j2:
+            # 삭제된 경우 삭제 위치 앞뒤 줄이 속한 블록을 변경된 것으로 취급
+            touched.update(line for line in (j1, j1 + 1) if 1 <= line <= len(new_lines))
+        else:
+            touched.update(range(j1 + 1, j2 + 1))
+
+    return line_map, touched
+
+def plan_incremental(old_code: str, old_issues: list[dict], new_code: str) -> IncrementalPlan | None:
+    ''' plan_incremental
+        이전 리뷰 대비 변경된 최상위 블록만 다시 리뷰하기 위한 계획 수립
+        I: 이전 코드 (String), 이전 리뷰의 이슈 목록 (LIST<CodeIssue>), 새 코드 (String)
+        O: 증분 리뷰 계획 (IncrementalPlan), 새 코드를 파싱할 수 없거나 변경 범위가 크면 None (전체 리뷰 필요)
+    '''
+    try:
+        blocks = top_level_blocks(new_code)
+    except SyntaxError:
+        return None
+
+    line_map, touched = map_lines(old_code, new_code)
+    total_lines = max(len(new_code.splitlines()), 1)
+    if len(touched) / total_lines > INCREMENTAL_MAX_CHANGED_RATIO:
+        return None
+
+    changed = [(start, end) for start, end in blocks if any(start <= line <= end for line in touched)]
+
+    return {
+        "changed": changed,
+        "skeleton": _skeleton(new_code, changed),
+        "carried_issues": _carry_issues(old_issues, line_map, changed),
+    }
+
+def in_ranges(start_line, end_line, ranges: list[tuple[int, int]]) -> bool:
+    ''' in_ranges
+        이슈의 줄 범위가 주어진 범위 중 하나에 포함되는지 확인
+    '''
+    if not isinstance(start_line, int) or not isinstance(end_line, int):
+        return False
+
+    return any(start <= start_line and end_line <= end for start, end in ranges)
+
+def _carry_issues(old_issues: list[dict], line_map: dict[int, int], changed: list[tuple[int, int]]) -> list[dict]:
+    # 이슈의 모든 줄이 그대로 남아 있고, 다시 리뷰할 블록과 겹치지 않는 이슈만 줄 번호를 옮겨서 유지
+    carried = []
+    for issue in old_issues:
+        start_line, end_line = issue.get('start_line'), issue.get('end_line')
+        if not isinstance(start_line, int) or not isinstance(end_line, int):
+            continue
+        if not all(line in line_map for line in range(start_line, end_line + 1)):
+            continue
+
+        new_start, new_end = line_map[start_line], line_map[end_line]
+        if new_end - new_start != end_line - start_line:
+            continue
+        if any(new_start <= end and start <= new_end for start, end in changed):
+            continue
+        carried.append(dict(issue, start_line=new_start, end_line=new_end))
+
+    return carried
+
+def _skeleton(code: str, changed: list[tuple[int, int]]) -> str:
+    # 변경되지 않은 함수·클래스는 선언부만 남기고 본문을 "..."으로 대체 (빈 줄로 채워 줄 번호 유지)
+    # import, 대입 등 나머지 최상위 문장은 변경된 블록의 문맥으로 그대로 유지
+    lines = code.splitlines()
+    for node in ast.parse(code).body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        if any(start <= node.lineno <= end for start, end in changed):
+            continue
+
+        body_start = node.body[0].lineno
+        if lines[body_start - 1][:node.body[0].col_offset].strip():
+            # 본문이 선언부와 같은 줄에 있으면 그대로 유지
+            continue
+        lines[body_start - 1] = " " * node.body[0].col_offset + "..."
+        for line in range(body_start, node.end_lineno):
+            lines[line] = ""
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,168 @@
+import re
+import json
+from typing import Literal
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+'''
+====================
+       SCHEMA
+====================
+'''
+
+class CodeIssue(BaseModel):
+    title: str
+    description: str = ""
+    issue_type: str = ""
+    severity: Literal["CRITICAL", "WARNING"] = "CRITICAL"
+    start_line: int = Field(ge=1)
+    end_line: int = Field(ge=1)
+    code_snippet: list[str] = []
+
+    @field_validator("severity", mode="before")
+    @classmethod
+    def _normalize_severity(cls, value):
+        # "critical", "Warning" 등 대소문자가 다른 응답도 허용, 알 수 없는 값은 놓치지 않도록 CRITICAL로 취급
+        value = str(value or "").strip().upper()
+        return value if value in ("CRITICAL", "WARNING") else "CRITICAL"
+
+    @field_validator("code_snippet", mode="before")
+    @classmethod
+    def _split_snippet(cls, value):
+        # 여러 줄 문자열로 응답한 경우 줄 목록으로 변환
+        if isinstance(value, str):
+            return value.splitlines()
+        return value or []
+
+
+class IssueReport(BaseModel):
+    pylint_score: float | None = None
+    issues: list[CodeIssue] = []
+
+
+class IssueParseError(ValueError):
+    # output: 해석에 실패한 LLM 응답 (응답 수정 요청 시 사용)
+    output: str = ""
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+def parse_issue_report(output: str, code: str) -> tuple[list[dict], float | None]:
+    ''' parse_issue_report
+        LLM 응답에서 이슈 목록과 pylint 점수를 추출하고 원본 코드 기준으로 검증
+        - 마크다운 코드 블록, 앞뒤 설명 문구, 최상위 배열([]) 응답 허용
+        - 응답이 중간에 잘린 경우 완전한 이슈 객체까지만 사용
+        - 스키마에 맞지 않는 이슈는 제외하고, 줄 번호·코드 조각은 원본 코드와 맞춤 (validate_issue)
+        I: LLM 응답 (String), 리뷰 대상 코드 (String)
+        O: (이슈 목록 (LIST<DICT>), pylint 점수) 튜플 - JSON을 찾을 수 없으면 IssueParseError 발생
+    '''
+    data = _decode_json(output)
+
+    if isinstance(data, list):
+        data = {"issues": data}
+    if not isinstance(data, dict):
+        raise IssueParseError(f"Expected a JSON object with 'issues', got {type(data).__name__}")
+
+    try:
+        pylint_score = IssueReport.model_validate({"pylint_score": data.get("pylint_score")}).pylint_score
+    except ValidationError:
+        pylint_score = None
+
+    lines = code.splitlines()
+    issues = []
+    for item in data.get("issues") or []:
+        try:
+            issue = CodeIssue.model_validate(item)
+        except ValidationError:
+            continue
+        issue = validate_issue(issue, lines)
+        if issue is not None:
+            issues.append(issue.model_dump())
+
+    return issues, pylint_score
+
+def validate_issue(issue: CodeIssue, lines: list[str]) -> CodeIssue | None:
+    ''' validate_issue
+        이슈의 줄 범위와 코드 조각이 원본 코드와 일치하는지 확인하고 보정
+        - 코드 조각이 다른 위치에 있으면 줄 번호를 그 위치로 이동
+        - 코드 조각이 없거나 원본에서 찾을 수 없으면 줄 범위의 원본 코드로 대체
+        I: 이슈 (CodeIssue), 원본 코드 줄 목록 (LIST<String>)
+        O: 보정된 이슈 (CodeIssue), 줄 범위가 코드 밖이고 코드 조각으로도 위치를 찾을 수 없으면 None
+    '''
+    start, end = issue.start_line, max(issue.end_line, issue.start_line)
+    snippet = [line.strip() for line in issue.code_snippet]
+    while snippet and not snippet[-1]:
+        snippet.pop()
+
+    def matches(at: int) -> bool:
+        window = lines[at - 1:at - 1 + len(snippet)]
+        return len(window) == len(snippet) and all(a.strip() == b for a, b in zip(window, snippet))
+
+    if snippet and not matches(start):
+        # 보고된 위치에서 가장 가까운 일치 위치로 이동
+        candidates = [at for at in range(1, len(lines) - len(snippet) + 2) if matches(at)]
+        if candidates:
+            start = min(candidates, key=lambda at: abs(at - issue.start_line))
+            end = start + len(snippet) - 1
+        else:
+            snippet = []
+    elif snippet:
+        end = max(end, start + len(snippet) - 1)
+
+    if start > len(lines):
+        return None
+    end = min(end, len(lines))
+
+    return issue.model_copy(update={"start_line": start, "end_line": end, "code_snippet": lines[start - 1:end]})
+
+def _decode_json(output: str):
+    # 1) 전체가 JSON인 경우
+    text = output.strip()
+    text = re.sub(r"^```[a-zA-Z]*\s*", "", text)
+    text = re.sub(r"\s*```$", "", text)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    # 2) 앞뒤에 다른 문구가 있는 경우 첫 JSON 값만 사용
+    decoder = json.JSONDecoder()
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise IssueParseError("No JSON found in LLM output")
+    start = min(starts)
+    try:
+        return decoder.raw_decode(text, start)[0]
+    except json.JSONDecodeError:
+        pass
+
+    # 3) 응답이 잘린 경우 "issues" 배열에서 완전한 객체까지만 사용
+    issues_at = re.search(r'"issues"\s*:\s*\[', text)
+    array_at = issues_at.end() if issues_at else (start + 1 if text[start] == "[" else -1)
+    if array_at == -1:
+        raise IssueParseError("Malformed JSON in LLM output")
+
+    score = re.search(r'"pylint_score"\s*:\s*(-?[\d.]+|null)', text)
+    issues, pos = [], array_at
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] != "{":
+            break
+        try:
+            item, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            break
+        issues.append(item)
+    if not issues:
+        raise IssueParseError("Malformed JSON in LLM output")
+
+    try:
+        pylint_score = json.loads(score.group(1)) if score else None
+    except json.JSONDecodeError:
+        pylint_score = None
+
+    return {"pylint_score": pylint_score, "issues": issues}
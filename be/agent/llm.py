@@ -0,0 +1,137 @@
+import os
+import asyncio
+import weakref
+import threading
+from contextlib import asynccontextmanager
+from typing import TypedDict
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+load_dotenv()
+
+# LLM을 호출하는 그래프 노드 (노드별로 LLM_<노드명 대문자>_<항목> 환경 변수로 공통 설정을 덮어씀)
+#   예) LLM_GENERATE_UNIT_TESTS_MODEL=gpt-4.1-nano, LLM_EXTRACT_REFACTORING_ISSUES_BASE_URL=http://localhost:8000/v1
+LLM_NODES = ("extract_code_issues", "suggest_code_improvements", "extract_refactoring_issues", "generate_unit_tests")
+
+# 공통 설정
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "")                      # OpenAI 호환 서버 주소 (비어 있으면 OpenAI API)
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "0"))            # 응답 최대 토큰 수 (0이면 제한 없음)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))              # 요청 제한 시간(초)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "16"))         # 노드별 동시 LLM 호출 수
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))  # 프로세스 전체의 동시 LLM 호출 수 (제공자 요청 한도 보호)
+
+# 모든 모델이 공유하는 HTTP 연결 풀 크기
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+
+
+class ModelConfig(TypedDict):
+    model: str
+    base_url: str           # 비어 있으면 OpenAI API
+    api_key: str            # 비어 있으면 OPENAI_API_KEY (로컬 서버는 임의의 값 사용 가능)
+    max_tokens: int         # 0이면 제한 없음
+    timeout: float
+    concurrency: int
+
+
+def load_model_config(node: str) -> ModelConfig:
+    ''' load_model_config
+        노드별 환경 변수(LLM_<노드명>_MODEL 등)와 공통 설정을 합쳐 노드의 모델 설정 생성
+        I: 노드명 (String, 빈 문자열이면 공통 설정)
+        O: 모델 설정 (ModelConfig)
+    '''
+    prefix = f"LLM_{node.upper()}_" if node else "LLM_"
+    return {
+        "model": os.getenv(prefix + "MODEL", LLM_MODEL),
+        "base_url": os.getenv(prefix + "BASE_URL", LLM_BASE_URL),
+        "api_key": os.getenv(prefix + "API_KEY", ""),
+        "max_tokens": int(os.getenv(prefix + "MAX_TOKENS", str(LLM_MAX_TOKENS))),
+        "timeout": float(os.getenv(prefix + "TIMEOUT", str(LLM_TIMEOUT))),
+        "concurrency": int(os.getenv(prefix + "CONCURRENCY", str(LLM_CONCURRENCY))),
+    }
+
+
+MODEL_CONFIGS: dict[str, ModelConfig] = {node: load_model_config(node) for node in ("",) + LLM_NODES}
+
+# 모든 노드의 모델이 공유하는 HTTP 클라이언트 (연결 재사용, 제한 시간은 요청마다 모델 설정값 사용)
+_limits = httpx.Limits(max_connections=LLM_HTTP_MAX_CONNECTIONS, max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE)
+_http_client = httpx.Client(limits=_limits)
+_http_async_client = httpx.AsyncClient(limits=_limits)
+
+_models = {}                # 모델 설정 -> 채팅 모델 (처음 사용할 때 생성)
+_override = None            # set_llm으로 주입한 모델 (모든 노드에 사용)
+_lock = threading.Lock()
+# asyncio.Semaphore는 이벤트 루프에 묶이므로 루프별로 생성
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+'''
+====================
+      FUNCTION
+====================
+'''
+
+def get_llm(node: str = ""):
+    ''' get_llm
+        노드에 설정된 채팅 모델 반환 (같은 설정의 노드는 같은 모델 인스턴스를 공유)
+        I: 노드명 (String, 설정이 없는 노드는 공통 설정 사용)
+        O: LangChain 채팅 모델 (BaseChatModel)
+    '''
+    if _override is not None:
+        return _override
+
+    config = MODEL_CONFIGS.get(node, MODEL_CONFIGS[""])
+    key = tuple(value for name, value in config.items() if name != "concurrency")
+    with _lock:
+        if key not in _models:
+            _models[key] = _create_model(config)
+
+        return _models[key]
+
+def set_llm(model):
+    ''' set_llm
+        모든 노드가 사용하는 채팅 모델을 교체 (벤치마크·테스트에서 가짜 모델을 주입할 때 사용, None이면 노드별 설정으로 복원)
+        I: LangChain 채팅 모델 (BaseChatModel)
+    '''
+    global _override
+    _override = model
+
+@asynccontextmanager
+async def allm_slot(node: str = ""):
+    ''' allm_slot
+        노드별·프로세스 전체의 동시 LLM 호출 수 제한 (설정값을 넘으면 대기)
+    '''
+    loop = asyncio.get_running_loop()
+    if loop not in _async_semaphores:
+        _async_semaphores[loop] = {name: asyncio.Semaphore(config['concurrency']) for name, config in MODEL_CONFIGS.items()}
+        _async_semaphores[loop][None] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+    semaphores = _async_semaphores[loop]
+    async with semaphores.get(node, semaphores[""]), semaphores[None]:
+        yield
+
+def _create_model(config: ModelConfig) -> ChatOpenAI:
+    options = {}
+    if config['base_url']:
+        options['base_url'] = config['base_url']
+    if config['api_key']:
+        options['api_key'] = config['api_key']
+    if config['max_tokens']:
+        options['max_tokens'] = config['max_tokens']
+
+    return ChatOpenAI(
+        model=config['model'],
+        temperature=0,
+        timeout=config['timeout'],
+        http_client=_http_client,
+        http_async_client=_http_async_client,
+        **options,
+    )
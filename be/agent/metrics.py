@@ -0,0 +1,294 @@
+import time
+import inspect
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from langchain_core.callbacks import BaseCallbackHandler
+
+'''
+====================
+      REGISTRY
+====================
+'''
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help, self.type = name, help, "counter"
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, dict(key), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name, self.help, self.type = name, help, "histogram"
+        self.buckets = buckets
+        self._values = {}   # labels -> [버킷별 누적 개수, 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            counts = [c + 1 if value <= bound else c for c, bound in zip(counts, self.buckets)]
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in self._values.items():
+                labels = dict(key)
+                for bound, c in zip(self.buckets, counts):
+                    samples.append((self.name + "_bucket", dict(labels, le=f"{bound:g}"), c))
+                samples.append((self.name + "_bucket", dict(labels, le="+Inf"), count))
+                samples.append((self.name + "_sum", labels, total))
+                samples.append((self.name + "_count", labels, count))
+
+        return samples
+
+
+class MetricsRegistry:
+    ''' MetricsRegistry
+        프로세스 전역 지표 저장소, Prometheus 텍스트 형식으로 출력
+        collector: 조회 시점에 값을 계산하는 함수 (예: 캐시·작업 대기열 통계) -> [(이름, 타입, 설명, 라벨, 값)]
+    '''
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, buckets))
+
+    def register_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} {metric.type}"]
+            lines += [_format_sample(name, labels, value) for name, labels, value in metric.samples()]
+
+        described = set()
+        for collector in self._collectors:
+            for name, type_, help, labels, value in collector():
+                if name not in described:
+                    lines += [f"# HELP {name} {help}", f"# TYPE {name} {type_}"]
+                    described.add(name)
+                lines.append(_format_sample(name, labels, value))
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_sample(name: str, labels: dict, value: float) -> str:
+    if not labels:
+        return f"{name} {value}"
+    label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+    return f"{name}{{{label_str}}} {value}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram("review_stage_seconds", "Duration of review pipeline stages (graph nodes and static analysis tools)")
+STAGE_ERRORS = REGISTRY.counter("review_stage_errors_total", "Review pipeline stages that raised or did not finish")
+LLM_TOKENS = REGISTRY.counter("review_llm_tokens_total", "LLM tokens by node and kind (prompt, completion, cached)")
+CACHE_LOOKUPS = REGISTRY.counter("review_cache_lookups_total", "Review cache lookups by kind and result")
+PAYLOAD_BYTES = REGISTRY.histogram("review_payload_bytes", "Size of review payloads (submitted code, LLM output)", SIZE_BUCKETS)
+HTTP_SECONDS = REGISTRY.histogram("http_request_duration_seconds", "HTTP request duration by route")
+
+
+'''
+====================
+        TRACE
+====================
+'''
+
+# 현재 요청의 단계별 기록 (요청 단위로 타이밍을 응답에 포함할 때 사용)
+_current_trace: contextvars.ContextVar["ReviewTrace | None"] = contextvars.ContextVar("review_trace", default=None)
+# 현재 실행 중인 그래프 노드명 (LLM 토큰 집계 시 라벨로 사용)
+_current_node: contextvars.ContextVar[str] = contextvars.ContextVar("review_node", default="")
+
+
+class ReviewTrace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = []
+        self.tokens = {}
+        self.cache = {}
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, seconds: float, **labels):
+        with self._lock:
+            self.stages.append(dict(labels, stage=stage, seconds=round(seconds, 4)))
+
+    def add_tokens(self, node: str, kind: str, count: int):
+        with self._lock:
+            self.tokens.setdefault(node, {}).setdefault(kind, 0)
+            self.tokens[node][kind] += count
+
+    def add_cache(self, kind: str, result: str):
+        with self._lock:
+            self.cache.setdefault(kind, {}).setdefault(result, 0)
+            self.cache[kind][result] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started, 4),
+                "stages": list(self.stages),
+                "tokens": dict(self.tokens),
+                "cached_token_ratio": _cached_token_ratios(self.tokens),
+                "cache": dict(self.cache),
+            }
+
+
+@contextmanager
+def trace():
+    ''' trace
+        with 블록 안에서 실행되는 리뷰 단계의 소요 시간·토큰·캐시 사용 내역을 ReviewTrace에 기록
+    '''
+    review_trace = ReviewTrace()
+    token = _current_trace.set(review_trace)
+    try:
+        yield review_trace
+    finally:
+        _current_trace.reset(token)
+
+
+'''
+====================
+      RECORDING
+====================
+'''
+
+def current_node() -> str:
+    # 현재 실행 중인 그래프 노드명 (노드 밖이면 빈 문자열)
+    return _current_node.get()
+
+def record_stage(stage: str, seconds: float, error: bool = False, **labels):
+    STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+    if error:
+        STAGE_ERRORS.inc(stage=stage, **labels)
+    review_trace = _current_trace.get()
+    if review_trace is not None:
+        review_trace.add_stage(stage, seconds, **labels)
+
+def record_tool_results(results: dict):
+    ''' record_tool_results
+        정적 분석 도구별 실행 시간 및 상태 기록
+        I: 도구별 실행 결과 (DICT<도구명(String): ToolResult>)
+    '''
+    for tool, result in results.items():
+        record_stage("tool", result['elapsed'], error=result['status'] != "ok", tool=tool, status=result['status'])
+
+def record_cache(kind: str, hit: bool):
+    result = "hit" if hit else "miss"
+    CACHE_LOOKUPS.inc(kind=kind, result=result)
+    review_trace = _current_trace.get()
+    if review_trace is not None:
+        review_trace.add_cache(kind, result)
+
+def record_payload(kind: str, size: int):
+    PAYLOAD_BYTES.observe(size, kind=kind)
+
+def timed_node(node: str):
+    ''' timed_node
+        그래프 노드 함수(동기/비동기)의 실행 시간을 기록하는 데코레이터
+        I: 노드명 (String)
+    '''
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                token = _current_node.set(node)
+                started, error = time.perf_counter(), True
+                try:
+                    result = await func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    record_stage("node", time.perf_counter() - started, error=error, node=node)
+                    _current_node.reset(token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_node.set(node)
+            started, error = time.perf_counter(), True
+            try:
+                result = func(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                record_stage("node", time.perf_counter() - started, error=error, node=node)
+                _current_node.reset(token)
+        return wrapper
+
+    return decorator
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    ''' TokenUsageCallback
+        LLM 응답의 usage_metadata에서 프롬프트·응답·캐시 토큰 수를 읽어 현재 노드 기준으로 기록
+    '''
+    run_inline = True
+
+    def on_llm_end(self, response, **kwargs):
+        node = _current_node.get() or "unknown"
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                counts = {
+                    "prompt": usage.get("input_tokens", 0),
+                    "completion": usage.get("output_tokens", 0),
+                    "cached": (usage.get("input_token_details") or {}).get("cache_read", 0),
+                }
+                for kind, count in counts.items():
+                    if not count:
+                        continue
+                    LLM_TOKENS.inc(count, node=node, kind=kind)
+                    review_trace = _current_trace.get()
+                    if review_trace is not None:
+                        review_trace.add_tokens(node, kind, count)
+
+
+token_usage_callback = TokenUsageCallback()
+
+
+def _cached_token_ratios(tokens: dict) -> dict:
+    # 노드별 프롬프트 토큰 중 LLM 제공자의 프롬프트 캐시에서 읽은 비율
+    return {node: round(kinds.get("cached", 0) / kinds["prompt"], 4) for node, kinds in tokens.items() if kinds.get("prompt")}
+
+def _collect_cached_token_ratios():
+    tokens = {}
+    for _, labels, value in LLM_TOKENS.samples():
+        tokens.setdefault(labels['node'], {})[labels['kind']] = value
+
+    return [
+        ("review_llm_cached_token_ratio", "gauge", "Share of LLM prompt tokens served from the provider prompt cache by node",
+         {"node": node}, ratio)
+        for node, ratio in _cached_token_ratios(tokens).items()
+    ]
+
+
+REGISTRY.register_collector(_collect_cached_token_ratios)
\ No newline at end of file
@@ -0,0 +1,79 @@
+import os
+import re
+import queue
+import shutil
+import atexit
+import tempfile
+import threading
+from contextlib import contextmanager
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+# 분석할 코드를 저장하는 작업 폴더의 상위 경로 (메모리 기반 tmpfs인 /dev/shm을 우선 사용)
+WORKSPACE_ROOT = os.getenv(
+    "ANALYZER_WORKSPACE",
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+)
+
+
+class Workspace:
+    ''' Workspace
+        정적 분석용 작업 폴더 풀
+        요청마다 폴더를 만들고 지우는 대신 만들어 둔 폴더를 재사용하며, 반납할 때 내용을 비워 이전 요청의 파일이 남지 않도록 함
+        프로세스 종료 시 모든 작업 폴더 삭제
+    '''
+    def __init__(self, root: str = WORKSPACE_ROOT):
+        self.root = root
+        self._idle = queue.SimpleQueue()
+        self._dirs = []
+        self._lock = threading.Lock()
+        # 작업 폴더 경로 패턴 (mypy 캐시처럼 다른 프로세스의 작업 폴더 경로가 출력에 남는 경우도 포함)
+        self._path_pattern = re.compile(re.escape(os.path.join(root, "review_")) + r"[^\s" + re.escape(os.sep) + r"]+" + re.escape(os.sep))
+        atexit.register(self.cleanup)
+
+    @contextmanager
+    def acquire(self):
+        ''' acquire
+            비어 있는 작업 폴더를 빌려줌 (with 블록이 끝나면 내용을 비우고 반납)
+            O: 작업 폴더 경로 (String)
+        '''
+        try:
+            path = self._idle.get_nowait()
+        except queue.Empty:
+            path = tempfile.mkdtemp(prefix=f"review_{os.getpid()}_", dir=self.root)
+            with self._lock:
+                self._dirs.append(path)
+
+        try:
+            yield path
+        finally:
+            try:
+                _clear(path)
+                self._idle.put(path)
+            except FileNotFoundError:
+                # 외부에서 폴더가 삭제된 경우 풀에서 제외 (다음 요청에서 새로 생성)
+                pass
+
+    def strip_paths(self, text: str) -> str:
+        ''' strip_paths
+            도구 출력에서 작업 폴더 경로를 제거하여 같은 코드는 항상 같은 출력이 되도록 함
+        '''
+        return self._path_pattern.sub("", text)
+
+    def cleanup(self):
+        with self._lock:
+            for path in self._dirs:
+                shutil.rmtree(path, ignore_errors=True)
+            self._dirs = []
+
+
+def _clear(path: str):
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            os.unlink(entry.path)
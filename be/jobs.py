@@ -0,0 +1,144 @@
+import os
+import time
+import uuid
+import asyncio
+from be.store import ResultStore
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))               # 동시에 실행하는 리뷰 작업 수
+JOB_MAX_QUEUE = int(os.getenv("JOB_MAX_QUEUE", "100"))         # 대기열 최대 길이 (초과 시 제출 거부)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    ''' JobQueue
+        리뷰 요청을 즉시 작업 ID로 응답하고, 제한된 수의 워커가 백그라운드에서 실행하는 작업 대기열
+        작업 상태와 결과는 ResultStore에 저장되며 만료 시간이 지나면 삭제 (저장소가 저장할 때 주기적으로 삭제)
+    '''
+    def __init__(self, handler, store: ResultStore, workers: int = JOB_WORKERS, max_queue: int = JOB_MAX_QUEUE):
+        self.handler = handler
+        self.store = store
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue = None
+        self._tasks = []
+        self._running = 0
+        self._counters = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "store_errors": 0,
+                          "wait_seconds_total": 0.0, "run_seconds_total": 0.0}
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, payload: dict) -> dict:
+        ''' submit
+            작업을 대기열에 넣고 작업 정보를 반환
+            I: 작업 입력 (DICT)
+            O: 작업 정보 (DICT) - 대기열이 가득 차면 JobQueueFull 예외 발생
+        '''
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        if self._queue.full():
+            self._counters["rejected"] += 1
+            raise JobQueueFull(f"Job queue is full ({self.max_queue})")
+
+        # 워커가 기록하는 실행 상태를 덮어쓰지 않도록 대기 상태를 먼저 저장한 뒤 대기열에 넣음
+        await self.store.aput(job['job_id'], job)
+        try:
+            self._queue.put_nowait((job, payload))
+        except asyncio.QueueFull:
+            # 저장하는 동안 다른 요청으로 대기열이 가득 찬 경우
+            self._counters["rejected"] += 1
+            job.update(status="failed", error="Job queue is full", finished_at=time.time())
+            await self.store.aput(job['job_id'], job)
+            raise JobQueueFull(f"Job queue is full ({self.max_queue})")
+
+        self._counters["submitted"] += 1
+
+        return job
+
+    async def get(self, job_id: str) -> dict | None:
+        return await self.store.aget(job_id)
+
+    def stats(self) -> dict:
+        ''' stats
+            대기열 길이, 실행 중인 작업 수, 평균 대기/실행 시간 등 반환
+        '''
+        finished = self._counters["succeeded"] + self._counters["failed"]
+        started = finished + self._running
+
+        return dict(
+            self._counters,
+            queue_depth=self._queue.qsize() if self._queue else 0,
+            running=self._running,
+            workers=self.workers,
+            max_queue=self.max_queue,
+            avg_wait_seconds=self._counters["wait_seconds_total"] / started if started else 0.0,
+            avg_run_seconds=self._counters["run_seconds_total"] / finished if finished else 0.0,
+        )
+
+    async def _work(self):
+        # 작업 하나의 실패(저장소 오류 포함)로 워커가 종료되지 않도록 작업마다 처리
+        while True:
+            job, payload = await self._queue.get()
+            try:
+                await self._run(job, payload)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: dict, payload: dict):
+        self._running += 1
+        job['status'] = "running"
+        job['started_at'] = time.time()
+        self._counters["wait_seconds_total"] += job['started_at'] - job['submitted_at']
+        await self._save(job)
+
+        try:
+            job['result'] = await self.handler(payload)
+            job['status'] = "done"
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = "failed"
+        finally:
+            if job['status'] == "running":
+                # 서버 종료 등으로 작업이 취소된 경우
+                job.update(status="failed", error="Job was cancelled")
+            job['finished_at'] = time.time()
+            self._counters["run_seconds_total"] += job['finished_at'] - job['started_at']
+            self._running -= 1
+            if not await self._save(job) and job['status'] == "done":
+                # 결과를 저장하지 못하면 조회 시 완료되지 않은 상태로 남으므로 결과 없이 실패로 저장
+                job.update(status="failed", result=None, error="Failed to save the job result")
+                await self._save(job)
+            self._counters["succeeded" if job['status'] == "done" else "failed"] += 1
+
+    async def _save(self, job: dict) -> bool:
+        # 작업 상태를 저장 (다른 프로세스가 SQLite 파일을 오래 잠근 경우 등 실패하면 경고만 출력하고 False 반환)
+        try:
+            await self.store.aput(job['job_id'], job)
+            return True
+        except Exception as e:
+            self._counters["store_errors"] += 1
+            print(f"[WARNING] Failed to save job {job['job_id']} ({job['status']}): {e}")
+            return False
@@ -2,23 +2,385 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
-from fastapi import FastAPI
+import json
+import time
+import asyncio
+import uuid
+import base64
+import binascii
+import zipfile
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 
-from be.agent.codeReview import CodeReviewGraph
+from be.agent.codeReview import CodeReviewGraph, ReviewMode, Severity, warm_up
+from be.agent.analyzer import start_workers, stop_workers, tool_versions, missing_tools, REQUIRE_TOOLS
+from be.agent.checkpoint import open_checkpointer
+from be.agent.cache import review_cache
+from be.agent import metrics
+from be.agent.batch import review_batch, normalize_path, extract_archive, BATCH_MAX_FILES, BATCH_MAX_FILE_BYTES
+from be.store import ResultStore
+from be.jobs import JobQueue, JobQueueFull
+from be.admission import AdmissionController, AdmissionRejected, AdmissionTicket, ADMISSION_CLIENT_HEADER
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with open_checkpointer() as checkpointer:
+        # 프로세스당 한 번만 그래프를 빌드 및 컴파일하여 모든 요청에서 재사용
+        # 실행 상태는 노드 단위로 체크포인트에 저장되어 실패한 리뷰를 이어서 실행할 수 있음
+        app.state.graph = CodeReviewGraph(checkpointer)
+        # 정적 분석 상주 프로세스를 미리 띄워 첫 요청부터 import 비용 없이 분석
+        start_workers()
+        # 분석 도구 확인, 모델·프롬프트 체인 생성 등 첫 요청이 부담하던 준비 작업을 미리 수행
+        await asyncio.to_thread(warm_up)
+        app.state.missing_tools = missing_tools()
+        if app.state.missing_tools:
+            if REQUIRE_TOOLS:
+                stop_workers()
+                raise RuntimeError(f"Static analysis tools are not available: {', '.join(app.state.missing_tools)}")
+            print(f"[WARNING] Static analysis tools are not available: {', '.join(app.state.missing_tools)}")
+
+        # 완료된 리뷰 결과를 보관 (GET /reviews/{review_id} 조회 및 base_review_id로 증분 리뷰 요청 시 사용)
+        app.state.reviews = ResultStore(namespace="reviews")
+
+        # 긴 리뷰는 작업 대기열에서 백그라운드로 실행하고 결과는 저장소에서 조회
+        graph = app.state.graph
+
+        async def run_job(payload: dict):
+            output = await graph.ainvoke(payload['query'], review_mode=payload['mode'],
+                                         severity_threshold=payload['severity_threshold'],
+                                         base_review=payload['base_review'], review_id=payload['review_id'])
+            return await _save_review(app, payload['review_id'], output)
+
+        app.state.jobs = JobQueue(run_job, ResultStore(namespace="jobs"))
+        # 동시 리뷰 수와 클라이언트별 요청 수를 제한하여 과부하 시 대기 후 429/503으로 응답
+        app.state.admission = AdmissionController()
+        await app.state.jobs.start()
+        yield
+        await app.state.jobs.stop()
+        stop_workers()
+
+app = FastAPI(lifespan=lifespan)
+# 수명 주기(lifespan)마다 등록하면 수집 함수가 중복되므로 모듈 로드 시 한 번만 등록
+metrics.REGISTRY.register_collector(lambda: _collect_service_metrics(app))
+
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.HTTP_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                                 route=route.path if route else "unmatched", status=response.status_code)
+
+    return response
+
+def _collect_service_metrics(app: FastAPI):
+    ''' _collect_service_metrics
+        /metrics 조회 시점의 캐시 및 작업 대기열 상태를 지표로 변환 (서버 시작 전에는 빈 목록)
+    '''
+    if not hasattr(app.state, "jobs"):
+        return []
+    cache = review_cache.stats()
+    jobs = app.state.jobs.stats()
+    admission = app.state.admission.stats()
+
+    return [
+        ("review_cache_entries", "gauge", "Entries in the in-memory review cache", {}, cache['memory_entries']),
+        ("review_cache_evictions_total", "counter", "Entries evicted from the on-disk review cache", {}, cache['evictions']),
+        ("review_jobs_queue_depth", "gauge", "Review jobs waiting in the queue", {}, jobs['queue_depth']),
+        ("review_jobs_running", "gauge", "Review jobs currently running", {}, jobs['running']),
+        ("review_jobs_total", "counter", "Review jobs by outcome", {"result": "submitted"}, jobs['submitted']),
+        ("review_jobs_total", "counter", "Review jobs by outcome", {"result": "rejected"}, jobs['rejected']),
+        ("review_jobs_total", "counter", "Review jobs by outcome", {"result": "succeeded"}, jobs['succeeded']),
+        ("review_jobs_total", "counter", "Review jobs by outcome", {"result": "failed"}, jobs['failed']),
+        ("review_jobs_store_errors_total", "counter", "Job status writes that failed", {}, jobs['store_errors']),
+        ("review_jobs_wait_seconds_total", "counter", "Total time jobs spent waiting in the queue", {}, jobs['wait_seconds_total']),
+        ("review_jobs_run_seconds_total", "counter", "Total time spent running jobs", {}, jobs['run_seconds_total']),
+        ("review_admission_active", "gauge", "Reviews currently holding an admission slot", {}, admission['active']),
+        ("review_admission_queue_depth", "gauge", "Reviews waiting for an admission slot", {}, admission['queue_depth']),
+        ("review_admission_total", "counter", "Review admission decisions by outcome", {"result": "admitted"}, admission['admitted']),
+        ("review_admission_total", "counter", "Review admission decisions by outcome", {"result": "rate_limited"}, admission['rate_limited']),
+        ("review_admission_total", "counter", "Review admission decisions by outcome", {"result": "queue_full"}, admission['queue_full']),
+        ("review_admission_total", "counter", "Review admission decisions by outcome", {"result": "queue_timeout"}, admission['queue_timeout']),
+        ("review_admission_wait_seconds_total", "counter", "Total time admitted reviews waited for a slot", {}, admission['wait_seconds_total']),
+    ]
+
+async def _save_review(app: FastAPI, review_id: str, output: dict) -> dict:
+    ''' _save_review
+        완료된 리뷰 결과를 저장하고, 리뷰 ID를 포함한 결과를 반환
+        (이전 리뷰 결과·미리 계산된 정적 분석 리포트는 입력값이므로 저장하지 않음)
+    '''
+    output = {key: value for key, value in output.items() if key not in ("base_review", "static_analysis")}
+    output['review_id'] = review_id
+    await app.state.reviews.aput(review_id, output)
+
+    return output
+
+async def _load_base_review(app: FastAPI, review_id: str | None) -> dict | None:
+    if review_id is None:
+        return None
+    review = await app.state.reviews.aget(review_id)
+    if review is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired review: {review_id}")
+
+    return {"code": review['user_code'], "issues": review.get('issues') or [], "pylint_score": review.get('pylint_score')}
+
+async def _admit(request: Request) -> AdmissionTicket:
+    ''' _admit
+        요청 한도와 동시 실행 수를 확인하고 실행 슬롯을 얻을 때까지 대기 (끝나면 _release 호출)
+        받을 수 없으면 429(요청 한도 초과) 또는 503(대기열 초과·대기 시간 초과)과 Retry-After 헤더로 응답
+    '''
+    started = time.perf_counter()
+    try:
+        ticket = await request.app.state.admission.acquire(_client_id(request))
+    except AdmissionRejected as e:
+        raise _admission_rejected(e)
+    metrics.record_stage("admission", time.perf_counter() - started)
+
+    return ticket
+
+@asynccontextmanager
+async def _admission_slot(request: Request):
+    ''' _admission_slot
+        요청 한도 확인 없이 실행 슬롯을 얻고 블록이 끝나면 반납 (배치 리뷰의 파일마다 사용)
+    '''
+    started = time.perf_counter()
+    ticket = await request.app.state.admission.acquire_slot()
+    metrics.record_stage("admission", time.perf_counter() - started)
+    try:
+        yield
+    finally:
+        _release(request, ticket)
+
+def _release(request: Request, ticket: AdmissionTicket):
+    request.app.state.admission.release(ticket)
+
+def _admission_rejected(error: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=error.status_code, detail=str(error), headers={"Retry-After": str(error.retry_after)})
+
+def _client_id(request: Request) -> str:
+    # 신뢰할 수 있는 프록시가 클라이언트 식별 헤더를 넣어 주는 경우 그 값을 사용하고, 아니면 접속 주소 사용
+    if ADMISSION_CLIENT_HEADER and request.headers.get(ADMISSION_CLIENT_HEADER):
+        return request.headers[ADMISSION_CLIENT_HEADER]
+
+    return request.client.host if request.client else "unknown"
+
+def _review_failed(review_id: str, error: Exception) -> HTTPException:
+    # 실패한 리뷰는 POST /reviews/{review_id}/resume 으로 마지막으로 완료된 노드 이후부터 재개 가능
+    return HTTPException(status_code=500, detail={"message": str(error), "review_id": review_id})
 
 class UserInput(BaseModel):
     query: str
+    mode: ReviewMode = "full"                   # issues_only: 이슈 추출만 수행 (리팩토링·단위 테스트 생략)
+    severity_threshold: Severity | None = None  # 이 심각도 이상의 이슈가 있을 때만 리팩토링 (기본: REVIEW_SEVERITY_THRESHOLD)
+    base_review_id: str | None = None           # 이전 리뷰 ID, 지정하면 변경된 부분만 다시 리뷰 (증분 리뷰)
+
+class SourceFile(BaseModel):
+    path: str
+    content: str
+
+class BatchInput(BaseModel):
+    files: list[SourceFile] = []
+    archive: str | None = None      # base64로 인코딩된 zip 파일 (포함된 .py 파일을 모두 리뷰)
+    mode: ReviewMode = "full"
+    severity_threshold: Severity | None = None
 
 @app.post("/code")
-def get_result_of_code_review(userInput: UserInput):
-    
-    graph = CodeReviewGraph()
-    output = graph.invoke(userInput.query)
-    
+async def get_result_of_code_review(userInput: UserInput, request: Request, timing: bool = False):
+
+    graph = request.app.state.graph
+    base_review = await _load_base_review(request.app, userInput.base_review_id)
+    review_id = uuid.uuid4().hex
+    metrics.record_payload("code", len(userInput.query.encode("utf-8")))
+    with metrics.trace() as review_trace:
+        ticket = await _admit(request)
+        try:
+            output = await graph.ainvoke(userInput.query, review_mode=userInput.mode,
+                                         severity_threshold=userInput.severity_threshold, base_review=base_review,
+                                         review_id=review_id)
+        except Exception as e:
+            raise _review_failed(review_id, e)
+        finally:
+            _release(request, ticket)
+    output = await _save_review(request.app, review_id, output)
+
+    response = {
+        "result": output,
+        "status": True
+        }
+    # timing=true 이면 노드·도구별 소요 시간, 토큰 수, 캐시 사용 내역을 함께 반환
+    if timing:
+        response['timing'] = review_trace.summary()
+
+    return response
+
+@app.post("/code/stream")
+async def stream_result_of_code_review(userInput: UserInput, request: Request, tokens: bool = False):
+    ''' 노드가 끝날 때마다 상태 변경분을 NDJSON 한 줄씩 전송 (tokens=true 이면 리팩토링 코드 토큰도 전송) '''
+    graph = request.app.state.graph
+    base_review = await _load_base_review(request.app, userInput.base_review_id)
+    review_id = uuid.uuid4().hex
+    # 스트림을 시작하기 전에 슬롯을 얻어 거절 시 HTTP 상태 코드로 응답하고, 스트림이 끝나면 반납
+    # (클라이언트 연결이 먼저 끊겨 스트림이 시작되지 않은 경우에도 응답 종료 후 background에서 반납)
+    ticket = await _admit(request)
+
+    async def event_stream():
+        try:
+            output = {'user_code': userInput.query, 'review_mode': userInput.mode}
+            async for event in graph.astream(userInput.query, tokens=tokens, review_mode=userInput.mode,
+                                             severity_threshold=userInput.severity_threshold, base_review=base_review,
+                                             review_id=review_id):
+                if event['event'] == "update":
+                    output.update(event['data'])
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+            await _save_review(request.app, review_id, output)
+            yield json.dumps({"event": "end", "review_id": review_id}) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "data": str(e), "review_id": review_id}, ensure_ascii=False) + "\n"
+        finally:
+            _release(request, ticket)
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson",
+                             background=BackgroundTask(_release, request, ticket))
+
+@app.post("/code/batch")
+async def get_result_of_batch_code_review(batchInput: BatchInput, request: Request):
+    ''' 여러 파일(또는 zip 파일)을 한 번에 리뷰하고 파일별 결과와 요약을 반환 '''
+    files = {}
+    for source in batchInput.files:
+        path = normalize_path(source.path)
+        if path is None:
+            raise HTTPException(status_code=400, detail=f"Invalid file path: {source.path}")
+        if len(source.content.encode("utf-8")) > BATCH_MAX_FILE_BYTES:
+            raise HTTPException(status_code=413, detail=f"File is too large: {source.path}")
+        files[path] = source.content
+
+    if batchInput.archive:
+        try:
+            files.update(extract_archive(base64.b64decode(batchInput.archive)))
+        except (binascii.Error, zipfile.BadZipFile) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid archive: {e}")
+
+    if not files:
+        raise HTTPException(status_code=400, detail="No Python files to review")
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files: {len(files)} > {BATCH_MAX_FILES}")
+
+    # 요청 한도는 요청 단위로 한 번 확인하고, 동시 리뷰 수는 파일마다 실행 슬롯을 얻어 제한
+    try:
+        request.app.state.admission.check_rate(_client_id(request))
+    except AdmissionRejected as e:
+        raise _admission_rejected(e)
+    output = await review_batch(request.app.state.graph, files,
+                                lambda review_id, output: _save_review(request.app, review_id, output),
+                                lambda: _admission_slot(request),
+                                review_mode=batchInput.mode,
+                                severity_threshold=batchInput.severity_threshold)
+
+    return {
+        "result": output,
+        "status": True
+        }
+
+@app.post("/jobs", status_code=202)
+async def submit_code_review_job(userInput: UserInput, request: Request):
+    ''' 리뷰 작업을 대기열에 넣고 작업 ID를 즉시 반환 (결과는 GET /jobs/{job_id}로 조회) '''
+    payload = dict(userInput.model_dump(), base_review=await _load_base_review(request.app, userInput.base_review_id),
+                   review_id=uuid.uuid4().hex)
+    # 작업은 대기열의 워커 수만큼만 실행되므로 클라이언트별 요청 한도만 적용
+    try:
+        request.app.state.admission.check_rate(_client_id(request))
+    except AdmissionRejected as e:
+        raise _admission_rejected(e)
+    try:
+        job = await request.app.state.jobs.submit(payload)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
     return {
-        "result": output, 
+        "result": {"job_id": job['job_id'], "status": job['status'], "review_id": payload['review_id']},
         "status": True
-        }
\ No newline at end of file
+        }
+
+@app.get("/jobs/stats")
+async def get_job_stats(request: Request):
+    return {
+        "result": request.app.state.jobs.stats(),
+        "status": True
+        }
+
+@app.get("/jobs/{job_id}")
+async def get_code_review_job(job_id: str, request: Request):
+    job = await request.app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+
+    return {
+        "result": job,
+        "status": True
+        }
+
+@app.get("/reviews/{review_id}")
+async def get_code_review(review_id: str, request: Request):
+    ''' 완료된 리뷰 결과 조회 '''
+    review = await request.app.state.reviews.aget(review_id)
+    if review is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired review: {review_id}")
+
+    return {
+        "result": review,
+        "status": True
+        }
+
+@app.post("/reviews/{review_id}/resume")
+async def resume_code_review(review_id: str, request: Request):
+    ''' 실패한 리뷰를 마지막으로 완료된 노드 이후부터 이어서 실행 (이미 완료된 리뷰는 저장된 결과를 반환) '''
+    review = await request.app.state.reviews.aget(review_id)
+    if review is None:
+        ticket = await _admit(request)
+        try:
+            output = await request.app.state.graph.aresume(review_id)
+        except Exception as e:
+            raise _review_failed(review_id, e)
+        finally:
+            _release(request, ticket)
+        if output is None:
+            raise HTTPException(status_code=404, detail=f"No resumable review: {review_id}")
+        review = await _save_review(request.app, review_id, output)
+
+    return {
+        "result": review,
+        "status": True
+        }
+
+@app.get("/health")
+async def get_health():
+    ''' 프로세스 생존 여부 (liveness) '''
+    return {"status": True}
+
+@app.get("/health/ready")
+async def get_readiness(request: Request):
+    ''' 요청 처리 준비 여부 (readiness, 시작 준비 작업이 끝난 뒤에만 응답) - 모든 정적 분석 도구를 실행할 수 있으면 200, 아니면 503 '''
+    missing = request.app.state.missing_tools
+    if missing:
+        raise HTTPException(status_code=503, detail=f"Static analysis tools are not available: {', '.join(missing)}")
+
+    return {
+        "result": {"pid": os.getpid(), "tools": tool_versions()},
+        "status": True
+        }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    ''' Prometheus 텍스트 형식의 지표 '''
+    return metrics.REGISTRY.render()
+
+@app.get("/graph")
+def get_graph_image(request: Request):
+    ''' 디버그용: 요청 시에만 그래프 시각화 이미지(PNG)를 생성하여 반환 '''
+    image_bytes = request.app.state.graph.draw_png()
+
+    return Response(content=image_bytes, media_type="image/png")
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+'''
+====================
+      CONFIG
+====================
+'''
+
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "")                    # SQLite 파일 경로, 비어 있으면 메모리에 저장
+RESULT_TTL = float(os.getenv("RESULT_TTL", str(60 * 60)))               # 결과 보관 시간(초)
+RESULT_MAX_ENTRIES = int(os.getenv("RESULT_MAX_ENTRIES", "10000"))      # 메모리 저장 시 최대 항목 수 (초과 시 오래 전에 저장된 것부터 삭제)
+RESULT_PURGE_INTERVAL = float(os.getenv("RESULT_PURGE_INTERVAL", "60"))  # 저장할 때 만료된 항목을 삭제하는 최소 간격(초)
+
+
+class ResultStore:
+    ''' ResultStore
+        만료 시간이 있는 키-값 저장소 (작업 상태 및 리뷰 결과 보관용)
+        path가 주어지면 SQLite에 저장하여 여러 프로세스가 공유하고, 없으면 프로세스 메모리에 저장 (최대 max_entries개)
+        만료된 항목은 저장할 때 purge_interval초마다 삭제
+    '''
+    def __init__(self, path: str = RESULT_STORE_PATH, ttl: float = RESULT_TTL, namespace: str = "results",
+                 max_entries: int = RESULT_MAX_ENTRIES, purge_interval: float = RESULT_PURGE_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = time.monotonic()
+
+        if self.path:
+            with self._connect() as conn:
+                # 여러 서버 프로세스(uvicorn --workers)가 같은 파일을 공유하므로 WAL 모드로 읽기와 쓰기가 서로 막지 않도록 함
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                    "PRIMARY KEY (namespace, key))"
+                )
+
+    def put(self, key: str, value: dict, ttl: float | None = None):
+        ''' put
+            값을 저장 (같은 키가 있으면 덮어쓰고 만료 시간도 갱신)
+            I: 키 (String), JSON 직렬화 가능한 값 (DICT), 보관 시간(초, 없으면 기본값)
+        '''
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        if not self.path:
+            with self._lock:
+                self._memory[key] = (expires_at, value)
+                self._memory.move_to_end(key)
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+        else:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value, ensure_ascii=False), expires_at)
+                )
+
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self._last_purge = time.monotonic()
+            self.purge_expired()
+
+    def get(self, key: str) -> dict | None:
+        ''' get
+            키에 해당하는 값을 반환
+            I: 키 (String)
+            O: 저장된 값 (DICT), 없거나 만료된 경우 None
+        '''
+        now = time.time()
+        if not self.path:
+            with self._lock:
+                item = self._memory.get(key)
+                if item is None or item[0] < now:
+                    self._memory.pop(key, None)
+                    return None
+                return item[1]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM results WHERE namespace = ? AND key = ? AND expires_at >= ?",
+                (self.namespace, key, now)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def purge_expired(self) -> int:
+        ''' purge_expired
+            만료된 항목을 삭제
+            O: 삭제된 항목 수 (Int)
+        '''
+        now = time.time()
+        if not self.path:
+            with self._lock:
+                expired = [key for key, (expires_at, _) in self._memory.items() if expires_at < now]
+                for key in expired:
+                    del self._memory[key]
+            return len(expired)
+
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM results WHERE namespace = ? AND expires_at < ?", (self.namespace, now))
+
+        return cursor.rowcount
+
+    async def aput(self, key: str, value: dict, ttl: float | None = None):
+        ''' aput
+            put의 비동기 버전 (SQLite 저장은 스레드에서 실행하여 다른 프로세스가 파일을 잠근 동안 이벤트 루프를 막지 않음)
+        '''
+        if not self.path:
+            return self.put(key, value, ttl)
+        await asyncio.to_thread(self.put, key, value, ttl)
+
+    async def aget(self, key: str) -> dict | None:
+        ''' aget
+            get의 비동기 버전
+        '''
+        if not self.path:
+            return self.get(key)
+
+        return await asyncio.to_thread(self.get, key)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
\ No newline at end of file
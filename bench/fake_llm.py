@@ -0,0 +1,120 @@
+import json
+import time
+import random
+import asyncio
+import hashlib
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+
+'''
+====================
+    CANNED OUTPUT
+====================
+'''
+
+# 노드별 고정 응답 (프롬프트에 포함된 문구로 어떤 노드의 호출인지 구분)
+CANNED_ISSUES = {
+    "pylint_score": 6.5,
+    "issues": [
+        {
+            "title": "Possible SQL injection",
+            "description": "User input is interpolated directly into an SQL query.",
+            "issue_type": "Security Issue",
+            "severity": "CRITICAL",
+            "start_line": 1,
+            "end_line": 1,
+            "code_snippet": []
+        }
+    ]
+}
+CANNED_REFACTORING = '''```python
+def process_user_input(user_data):
+    query = "SELECT * FROM users WHERE id = %s"  # Fixed: Possible SQL injection
+    return query, (user_data['id'],)
+```'''
+CANNED_UNIT_TESTS = '''```python
+import unittest
+
+
+class TestProcessUserInput(unittest.TestCase):
+    def test_returns_parameterized_query(self):
+        query, params = process_user_input({'id': 1})
+        self.assertIn("%s", query)
+        self.assertEqual(params, (1,))
+```'''
+
+
+class FakeChatModel(BaseChatModel):
+    ''' FakeChatModel
+        네트워크 없이 파이프라인 처리량을 측정하기 위한 가짜 채팅 모델
+        - latency: 응답 지연(초), jitter: 지연의 ±비율 (프롬프트 해시로 결정되므로 같은 입력은 항상 같은 지연)
+        - 토큰 사용량은 글자 수 / 4 로 추정하여 usage_metadata에 기록
+    '''
+    model_name: str = "fake-chat-model"
+    temperature: float = 0
+    latency: float = 0.5
+    jitter: float = 0.2
+    tokens_per_chunk: int = 4
+    issues: dict = CANNED_ISSUES
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = _prompt_text(messages)
+        time.sleep(self._delay(prompt))
+
+        return self._result(prompt)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = _prompt_text(messages)
+        await asyncio.sleep(self._delay(prompt))
+
+        return self._result(prompt)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = _prompt_text(messages)
+        text = self._reply(prompt)
+        chunk_size = self.tokens_per_chunk * 4
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        delay = self._delay(prompt) / max(len(chunks), 1)
+
+        for i, piece in enumerate(chunks):
+            await asyncio.sleep(delay)
+            usage = self._usage(prompt, text) if i == len(chunks) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    def _reply(self, prompt: str) -> str:
+        if "static analysis" in prompt:
+            return "```json\n" + json.dumps(self.issues, ensure_ascii=False) + "\n```"
+        if "unittest" in prompt:
+            return CANNED_UNIT_TESTS
+
+        return CANNED_REFACTORING
+
+    def _result(self, prompt: str) -> ChatResult:
+        text = self._reply(prompt)
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, text))
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _delay(self, prompt: str) -> float:
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        factor = 1 + random.Random(seed).uniform(-self.jitter, self.jitter)
+
+        return max(self.latency * factor, 0.0)
+
+    @staticmethod
+    def _usage(prompt: str, text: str) -> dict:
+        input_tokens, output_tokens = len(prompt) // 4, len(text) // 4
+
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+def _prompt_text(messages) -> str:
+    return "\n".join(str(message.content) for message in messages)
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# 가짜 모델로 교체하므로 실제 API 호출은 없지만, import 시점에 만들어지는 OpenAI 클라이언트는 키가 필요함
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+import httpx
+import multiprocessing
+
+import be.agent.codeReview as codeReview
+from be.agent.cache import review_cache
+from be.agent.llm import set_llm
+from be.agent.analyzer import arun_static_analysis, tool_versions, MAX_CONCURRENCY
+from bench.fake_llm import FakeChatModel
+
+'''
+====================
+       CORPUS
+====================
+'''
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "..", "fe", "data", "task1")
+
+def load_corpus(paths: list[str]) -> list[str]:
+    ''' load_corpus
+        폴더(.txt, .py 파일) 또는 파일 경로들에서 리뷰할 코드 목록을 읽어옴
+        I: 경로 목록 (LIST<String>)
+        O: 코드 목록 (LIST<String>)
+    '''
+    corpus = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, fn) for fn in os.listdir(path) if fn.endswith((".txt", ".py")))
+        else:
+            files = [path]
+        for file_path in files:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                corpus.append(f.read())
+
+    return corpus
+
+
+'''
+====================
+       TARGETS
+====================
+'''
+
+async def run_graph(graph, code: str):
+    await graph.ainvoke(code)
+
+async def run_analyze(graph, code: str):
+    await codeReview._aanalyze_code(code)
+
+async def run_api(client: httpx.AsyncClient, code: str):
+    response = await client.post("/code", json={"query": code})
+    response.raise_for_status()
+
+
+async def benchmark(target: str, corpus: list[str], requests: int, concurrency: int, unique: bool) -> dict:
+    ''' benchmark
+        지정한 대상(graph, analyze, api)을 정해진 동시 실행 수로 반복 실행하고 지연 시간 분포를 측정
+        I: 대상 (String), 코드 목록 (LIST<String>), 총 요청 수 (Int), 동시 실행 수 (Int),
+           요청마다 코드를 다르게 만들어 캐시를 우회할지 여부 (Bool)
+        O: 측정 결과 (DICT)
+    '''
+    graph = codeReview.CodeReviewGraph()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], []
+
+    async def one(i: int, call):
+        code = corpus[i % len(corpus)]
+        if unique:
+            code += f"\n# bench request {i}\n"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(code)
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    async def run_all(call):
+        started = time.perf_counter()
+        await asyncio.gather(*[one(i, call) for i in range(requests)])
+        return time.perf_counter() - started
+
+    # 분석 워커의 import 비용 및 도구 버전 조회가 측정에 섞이지 않도록 먼저 한 번씩 실행
+    await asyncio.gather(*[arun_static_analysis("x = 1\n") for _ in range(MAX_CONCURRENCY)])
+    await asyncio.to_thread(tool_versions)
+
+    if target == "api":
+        from be.main import app
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                elapsed = await run_all(lambda code: run_api(client, code))
+    else:
+        call = run_graph if target == "graph" else run_analyze
+        elapsed = await run_all(lambda code: call(graph, code))
+
+    return summarize(target, latencies, errors, elapsed, concurrency)
+
+def summarize(target: str, latencies: list[float], errors: list[str], elapsed: float, concurrency: int) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(p: float):
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    # ru_maxrss 단위: Linux KB (macOS는 byte)
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "requests": len(latencies) + len(errors),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "latency_seconds": {
+            "mean": round(statistics.fmean(ordered), 4) if ordered else None,
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": ordered[-1] if ordered else None,
+        },
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 1),
+        "peak_child_rss_mb": round(_peak_child_rss_kb(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale // 1024) / 1024, 1),
+    }
+
+def _peak_child_rss_kb(finished_children_kb: int) -> int:
+    # 실행 중인 자식 프로세스(분석 워커)는 getrusage에 잡히지 않으므로 /proc에서 최대 RSS(VmHWM)를 합산
+    total = finished_children_kb
+    for child in multiprocessing.active_children():
+        try:
+            with open(f"/proc/{child.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+
+    return total
+
+
+'''
+====================
+        MAIN
+====================
+'''
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for the code review pipeline (uses a fake LLM)")
+    parser.add_argument("--target", choices=["graph", "analyze", "api"], default="graph")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--corpus", nargs="+", default=[DEFAULT_CORPUS], help="folders or files with code to review")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM latency per call (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="fake LLM latency jitter (fraction of latency)")
+    parser.add_argument("--cached", action="store_true", help="reuse identical code so the review cache can hit")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    set_llm(FakeChatModel(latency=args.latency, jitter=args.jitter))
+    corpus = load_corpus(args.corpus)
+
+    results = []
+    for concurrency in args.concurrency:
+        review_cache.clear()
+        result = asyncio.run(benchmark(args.target, corpus, args.requests, concurrency, unique=not args.cached))
+        results.append(result)
+        latency = result['latency_seconds']
+        print(f"[{result['target']}] concurrency={concurrency:<3} requests={result['requests']:<4} errors={result['errors']:<3} "
+              f"rps={result['requests_per_second']} p50={_fmt(latency['p50'])} p95={_fmt(latency['p95'])} "
+              f"p99={_fmt(latency['p99'])} peak_rss={result['peak_rss_mb']}MB (children {result['peak_child_rss_mb']}MB)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+def _fmt(value):
+    return f"{value:.3f}s" if value is not None else "-"
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,37 +1,104 @@
+import os
 import sys
+import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.decorators import singleton
 
+# 연결 제한 시간(초), 응답 대기 제한 시간(초) - 스트리밍은 다음 줄이 올 때까지의 대기 시간에 적용
+CONNECT_TIMEOUT = float(os.getenv("FE_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("FE_READ_TIMEOUT", "300"))
+# 연결 실패 및 일시적인 서버 오류(429, 502, 503, 504) 재시도 횟수와 백오프 계수 (Retry-After 헤더가 있으면 그 시간만큼 대기)
+MAX_RETRIES = int(os.getenv("FE_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("FE_RETRY_BACKOFF", "0.5"))
+# 작업 결과 조회 간격(초, 조회할 때마다 최대 POLL_MAX_INTERVAL까지 1.5배씩 증가)
+POLL_INTERVAL = float(os.getenv("FE_POLL_INTERVAL", "0.5"))
+POLL_MAX_INTERVAL = float(os.getenv("FE_POLL_MAX_INTERVAL", "5"))
+# 사용자 세션을 구분하는 헤더 (BE의 ADMISSION_CLIENT_HEADER를 같은 값으로 설정하면 세션별로 요청 한도 적용)
+CLIENT_ID_HEADER = os.getenv("FE_CLIENT_ID_HEADER", "X-Client-Id")
+
 
 # API 호출 클래스
 @singleton
 class ApiClient:
     def __init__(self):
         self.base_url = 'http://127.0.0.1:'
+        self.port = None
         if "--be_port" in sys.argv:
             index = sys.argv.index("--be_port") + 1
             self.port = sys.argv[index]
-    
-    def get(self, endpoint: str, params=None):
+
+        # 하나의 세션으로 BE 서버와의 연결을 재사용 (Streamlit 재실행마다 새 TCP 연결을 맺지 않음)
+        # 리뷰 요청은 같은 코드에 대해 같은 결과를 반환하므로(캐시) POST도 재시도 대상에 포함
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=10))
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    def get(self, endpoint: str, params=None, client_id: str | None = None):
         if not self.port: return False
         url = self.base_url + self.port + '/' + endpoint
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params, headers=_headers(client_id), timeout=self.timeout)
 
         return response.json()
-    
-    def post(self, endpoint: str, data: dict):
+
+    def post(self, endpoint: str, data: dict, params=None, client_id: str | None = None):
         url = self.base_url + self.port + '/' + endpoint
-        response = requests.post(url, json=data)
+        response = self.session.post(url, json=data, params=params, headers=_headers(client_id), timeout=self.timeout)
         try:
             return response.json()
         except Exception as e:
             print(f"[JSONDecodeError] {e} The response is not of JSON type. \nResponse: {response.text}")
             raise
-        
 
+    def stream(self, endpoint: str, data: dict, params=None, client_id: str | None = None):
+        ''' stream
+            NDJSON 스트리밍 응답을 한 줄씩 읽어 이벤트(DICT)로 반환
+        '''
+        url = self.base_url + self.port + '/' + endpoint
+        with self.session.post(url, json=data, params=params, headers=_headers(client_id), stream=True,
+                               timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+
+    def poll(self, endpoint: str, data: dict, timeout: float = READ_TIMEOUT, client_id: str | None = None):
+        ''' poll
+            작업 대기열에 리뷰를 제출하고(POST endpoint), 끝날 때까지 작업 상태를 조회하여 바뀔 때마다 반환
+            (스트리밍 응답을 받을 수 없는 환경에서 사용)
+            I: 작업 제출 엔드포인트 (String, 예: 'jobs'), 요청 본문 (DICT), 최대 대기 시간(초), 사용자 세션 ID (String)
+            O: 작업 정보 (제너레이터<DICT>, status: queued → running → done/failed)
+        '''
+        submitted = self.post(endpoint, data, client_id=client_id)
+        if not submitted.get('status'):
+            raise RuntimeError(submitted.get('detail', submitted))
+        job_id = submitted['result']['job_id']
+
+        deadline = time.monotonic() + timeout
+        interval, last_status = POLL_INTERVAL, None
+        while True:
+            job = self.get(f'{endpoint}/{job_id}', client_id=client_id)['result']
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield job
+            if job['status'] in ('done', 'failed'):
+                return
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Review job {job_id} did not finish in {timeout}s")
 
-        
-        
+            time.sleep(interval)
+            interval = min(interval * 1.5, POLL_MAX_INTERVAL)
 
 
-    
\ No newline at end of file
+def _headers(client_id: str | None) -> dict:
+    # 사용자 세션 ID를 헤더로 전달 (모든 세션이 같은 Streamlit 서버 주소로 요청하므로 BE에서 세션을 구분하는 데 사용)
+    return {CLIENT_ID_HEADER: client_id} if client_id else {}
@@ -1,6 +1,8 @@
 import sys
 import os
 import json
+import time
+import uuid
 import streamlit as st
 from api_client import ApiClient
 
@@ -10,6 +12,11 @@ title = "Automated Code Review and Enhancement"
 st.set_page_config(page_title=title, layout="wide")
 st.title(title)
 
+# 스트리밍 중 화면을 다시 그리는 최소 간격(초)
+RENDER_INTERVAL = 0.2
+# 리뷰 결과를 받는 방식 (stream: 노드가 끝날 때마다 스트리밍으로 수신, poll: 작업으로 제출 후 상태 조회)
+REVIEW_TRANSPORT = os.getenv("FE_REVIEW_TRANSPORT", "stream")
+
 # Functions
 def _changeFileName(file_name: str):
     ''' _changeFileName
@@ -25,105 +32,121 @@ def _changeFileName(file_name: str):
 def _loadTestCase(task_type: str):
     ''' _loadTestCase
         Task 별로 Test Case 파일들의 이름과 내용을 반환해주는 함수
+        파일 목록과 수정 시각이 같으면 캐시된 내용을 사용하여 Streamlit 재실행마다 파일을 다시 읽지 않음
         I: Test Case 문서가 저장된 폴더 경로 (String)
         O: 경로 내 포함된 txt 파일들의 이름과 내용이 담긴 딕셔너리 (DICT<파일명: 본문 내용>)
     '''
     repo_dir = os.getcwd()
     dir = repo_dir+"/fe/data/"+task_type
 
-    examples =dict()
-    if os.path.exists(dir):
-        txt_files = [fn for fn in os.listdir(dir) if fn.endswith('.txt')]
-        if len(txt_files) > 0:
-            for file_name in sorted(txt_files):
-                file_path = os.path.join(dir, file_name)
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
+    if not os.path.exists(dir):
+        return dict()
+    snapshot = tuple(sorted((entry.name, entry.stat().st_mtime_ns)
+                            for entry in os.scandir(dir) if entry.name.endswith('.txt')))
 
-                    examples[_changeFileName(file_name)] = content
-    
-    return examples
+    return _readTestCases(dir, snapshot)
 
-def _onSubmit(query: str):
-    ''' _onSubmit
-        사용자 입력이 주어졌을 때 WAS 서버로 POST 요청을 수행
-        I: Test Case 문서가 저장된 폴더 경로 (String)
-        O: 경로 내 포함된 txt 파일들의 이름과 내용이 담긴 딕셔너리 (DICT<파일명: 본문 내용>)
+@st.cache_data(show_spinner=False)
+def _readTestCases(dir: str, snapshot: tuple):
+    ''' _readTestCases
+        Test Case 파일들을 읽어서 반환 (snapshot: (파일명, 수정 시각) 목록, 바뀌면 캐시를 무효화하는 키로 사용)
     '''
-    api = ApiClient()
-    response = api.post('code', data={"query": query})
-    st.session_state['code_review'] = response['result']
+    examples = dict()
+    for file_name, _ in snapshot:
+        file_path = os.path.join(dir, file_name)
+        with open(file_path, 'r', encoding='utf-8') as file:
+            examples[_changeFileName(file_name)] = file.read()
 
-# Variables & Logic
-examples = _loadTestCase('task1')
-examples['자유 작성'] = ''
-if not st.session_state.get('code_review', False):
-    st.session_state['code_review'] = {}
-
-
-# UI
-input_area, output_area = st.columns(2)
-
-# 1. 사용자 입력 영역
-with input_area:
-    selected = st.selectbox(
-        label="Test Case",
-        options=examples.keys(),
-        index=len(examples)-1,
-    )
-    query = st.text_area(
-        label='Enter Python code to review...', 
-        value=examples[selected] if selected else '',
-        height='content'
-    )
+    return examples
 
-    _, btn_col = st.columns([4, 1])
-    btn_col.button('Submit', 
-                   on_click=_onSubmit, 
-                   args=(query,),
-                   disabled=(not query),
-                   type='primary', 
-                   use_container_width=True)
+def _sessionId():
+    ''' _sessionId
+        브라우저 세션마다 고유한 ID 반환 (BE의 클라이언트별 요청 한도를 세션 단위로 적용하기 위해 요청 헤더로 전달)
+    '''
+    if 'client_id' not in st.session_state:
+        st.session_state['client_id'] = uuid.uuid4().hex
 
-# 2. 결과 출력 영역
-with output_area.container(border=True):
-    st.header('Report')
+    return st.session_state['client_id']
 
+def _streamReview(query: str):
+    ''' _streamReview
+        사용자 입력이 주어졌을 때 WAS 서버로 스트리밍 POST 요청을 수행하고, 노드가 끝날 때마다 누적된 리뷰 결과를 반환
+        I: 사용자가 입력한 코드 (String)
+        O: 지금까지 도착한 리뷰 결과 (제너레이터<DICT>)
+    '''
+    api = ApiClient()
+    review = {}
+    for event in api.stream('code/stream', data={"query": query}, params={"tokens": "true"}, client_id=_sessionId()):
+        if event['event'] == 'update':
+            review.update(event['data'])
+        elif event['event'] == 'token':
+            # 리팩토링 코드는 생성되는 토큰을 그대로 이어 붙여 미리 보여줌 (노드 완료 시 정리된 코드로 대체)
+            review['refactoring_code'] = review.get('refactoring_code', '') + event['data']
+        elif event['event'] == 'error':
+            st.error(event['data'])
+        st.session_state['code_review'] = review
+        yield review
+
+def _pollReview(query: str):
+    ''' _pollReview
+        사용자 입력을 리뷰 작업으로 제출하고, 작업 상태가 바뀔 때마다 리뷰 결과를 반환 (스트리밍을 사용할 수 없을 때)
+        I: 사용자가 입력한 코드 (String)
+        O: 지금까지의 리뷰 결과 (제너레이터<DICT>, 작업이 끝나면 전체 결과)
+    '''
+    api = ApiClient()
+    review = {'user_code': query}
+    for job in api.poll('jobs', data={"query": query}, client_id=_sessionId()):
+        if job['status'] == 'done':
+            review = job['result']
+        elif job['status'] == 'failed':
+            st.error(job['error'])
+        st.session_state['code_review'] = review
+        yield review
+
+def _renderReport(review: dict):
+    ''' _renderReport
+        리뷰 결과(이슈, 리팩토링 코드, 단위 테스트)를 화면에 출력
+        I: 리뷰 결과 (DICT)
+    '''
     # Metrics
-    if st.session_state['code_review'].get('issues', False) and st.session_state['code_review'].get('refactoring_issues', False):
+    # 리팩토링을 건너뛴 경우(기준 심각도 미만, issues_only 모드)에도 사용자 코드의 지표는 표시하고, 리팩토링 코드 지표는 있을 때만 표시
+    if review.get('issues') is not None:
+        refactored = review.get('refactoring_issues') is not None
         cnt_issues_area, pylint_score_area = st.columns(2)
         
         with cnt_issues_area.container(border=True):
             # 이슈 개수
             st.markdown('🔖 **Number of bugs and issues** included in the code')
-            cnt_iss = len(st.session_state['code_review']['issues'])
-            cnt_rf_iss = len(st.session_state['code_review']['refactoring_issues'])
+            cnt_iss = len(review['issues'])
 
             col1, col2 = st.columns(2)
             col1.metric(label='User Code', 
                     value=cnt_iss)
-            col2.metric(label='Refactored Code', 
-                    value=cnt_rf_iss, 
-                    delta=cnt_iss-cnt_rf_iss)
+            if refactored:
+                cnt_rf_iss = len(review['refactoring_issues'])
+                col2.metric(label='Refactored Code', 
+                        value=cnt_rf_iss, 
+                        delta=cnt_iss-cnt_rf_iss)
         
         with pylint_score_area.container(border=True):
             # pylint 점수
             st.markdown('🔖 **PyLint Score**')
-            pylint_score = st.session_state['code_review']['pylint_score']
-            rf_pylint_score = st.session_state['code_review']['refactoring_pylint_score']
+            pylint_score = review.get('pylint_score')
 
             col1, col2 = st.columns(2)
             col1.metric(label='User Code', 
                     value=pylint_score)
-            col2.metric(label='Refactored Code', 
-                    value=rf_pylint_score, 
-                    delta=rf_pylint_score-pylint_score)
+            if refactored:
+                rf_pylint_score = review.get('refactoring_pylint_score')
+                col2.metric(label='Refactored Code', 
+                        value=rf_pylint_score, 
+                        delta=rf_pylint_score-pylint_score if None not in (pylint_score, rf_pylint_score) else None)
         
     
     # Issues
-    if st.session_state['code_review'].get('issues', False) and len(st.session_state['code_review']['issues']) > 0:
+    if review.get('issues', False) and len(review['issues']) > 0:
         st.subheader('🎯 Issues')
-        issues = st.session_state['code_review']['issues']
+        issues = review['issues']
         for issue in issues:
             with st.expander(issue['title'], icon='🚨' if issue['severity']=='CRITICAL' else '⚠️'):
                 st.caption(issue['description'])
@@ -146,15 +169,62 @@ with output_area.container(border=True):
 
     
     # Refactoring Code
-    if st.session_state['code_review'].get('refactoring_code', False):
+    if review.get('refactoring_code', False):
         st.subheader('✏️ Refactored Code Suggestion')
-        refactoring_code = st.session_state['code_review']['refactoring_code']
+        refactoring_code = review['refactoring_code']
         st.code(refactoring_code, language='python')
     
 
     # Unit code
-    if st.session_state['code_review'].get('unit_code', False):
+    if review.get('unit_code', False):
         st.subheader('⚒️ Unit Test Generation')
-        unit_test_code = st.session_state['code_review']['unit_code']
+        unit_test_code = review['unit_code']
         st.code(unit_test_code, language='python')
-    
\ No newline at end of file
+
+# Variables & Logic
+examples = _loadTestCase('task1')
+examples['자유 작성'] = ''
+if not st.session_state.get('code_review', False):
+    st.session_state['code_review'] = {}
+
+
+# UI
+input_area, output_area = st.columns(2)
+
+# 1. 사용자 입력 영역
+with input_area:
+    selected = st.selectbox(
+        label="Test Case",
+        options=examples.keys(),
+        index=len(examples)-1,
+    )
+    query = st.text_area(
+        label='Enter Python code to review...', 
+        value=examples[selected] if selected else '',
+        height='content'
+    )
+
+    _, btn_col = st.columns([4, 1])
+    submitted = btn_col.button('Submit', 
+                   disabled=(not query),
+                   type='primary', 
+                   use_container_width=True)
+
+# 2. 결과 출력 영역
+with output_area.container(border=True):
+    st.header('Report')
+    report_area = st.empty()
+
+    if submitted:
+        # 결과가 도착하는 대로 다시 그려서 첫 노드(이슈 추출)가 끝나는 즉시 이슈부터 보여줌
+        last_rendered = 0.0
+        reviews = _pollReview(query) if REVIEW_TRANSPORT == 'poll' else _streamReview(query)
+        for review in reviews:
+            if time.monotonic() - last_rendered < RENDER_INTERVAL:
+                continue
+            with report_area.container():
+                _renderReport(review)
+            last_rendered = time.monotonic()
+
+    with report_area.container():
+        _renderReport(st.session_state['code_review'])
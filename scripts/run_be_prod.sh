@@ -0,0 +1,27 @@
+#!/bin/bash
+
+cd `dirname $0`/..
+
+PORT=$1
+if [ -z "$PORT" ]; then
+  PORT=8000                 # Default: 8000
+fi
+
+# 워커 프로세스 수 (기본: CPU 코어 수)
+WORKERS=${WORKERS:-$(nproc)}
+
+# 캐시, 리뷰 결과·작업 상태, 체크포인트를 SQLite 파일로 모든 워커가 공유 (재시작 후에도 유지)
+DATA_DIR=${REVIEW_DATA_DIR:-data}
+mkdir -p $DATA_DIR
+export REVIEW_CACHE_PATH=${REVIEW_CACHE_PATH:-$DATA_DIR/review_cache.sqlite}
+export RESULT_STORE_PATH=${RESULT_STORE_PATH:-$DATA_DIR/results.sqlite}
+export REVIEW_CHECKPOINT_PATH=${REVIEW_CHECKPOINT_PATH:-$DATA_DIR/checkpoints.sqlite}
+
+# 정적 분석 상주 프로세스는 워커마다 생성되므로 전체가 CPU 코어 수를 넘지 않도록 나눔
+CPU_PER_WORKER=$(( $(nproc) / WORKERS ))
+export ANALYZER_MAX_CONCURRENCY=${ANALYZER_MAX_CONCURRENCY:-$(( CPU_PER_WORKER > 0 ? CPU_PER_WORKER : 1 ))}
+# 분석 도구가 없으면 워커를 시작하지 않음
+export ANALYZER_REQUIRE_TOOLS=${ANALYZER_REQUIRE_TOOLS:-1}
+
+echo "Starting backend at port $PORT with $WORKERS workers"
+exec uvicorn be.main:app --host ${HOST:-0.0.0.0} --port $PORT --workers $WORKERS --no-access-log --timeout-graceful-shutdown 30
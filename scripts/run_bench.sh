@@ -0,0 +1,6 @@
+#!/bin/bash
+
+cd `dirname $0`/..
+
+# 예: scripts/run_bench.sh --target api --requests 50 --concurrency 1 8 32 --latency 1.0
+python -m bench.run "$@"
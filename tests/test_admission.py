@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from be.admission import AdmissionController, AdmissionRejected, TokenBuckets
+
+
+async def _settle():
+    # 대기 중인 태스크들이 한 단계씩 진행되도록 이벤트 루프를 몇 번 양보
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_rate_limit_is_disabled_by_default():
+    buckets = TokenBuckets(rate=0, burst=1)
+
+    assert all(buckets.take("client") == 0 for _ in range(100))
+
+
+def test_rate_limit_is_per_client():
+    controller = AdmissionController(buckets=TokenBuckets(rate=1, burst=2))
+    controller.check_rate("a")
+    controller.check_rate("a")
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.check_rate("a")
+    controller.check_rate("b")
+
+    assert rejected.value.status_code == 429
+    assert controller.stats()['rate_limited'] == 1
+
+
+def test_slots_are_handed_over_in_arrival_order():
+    async def scenario():
+        controller = AdmissionController(max_active=1, max_queue=4, queue_timeout=5)
+        first = await controller.acquire_slot()
+        order = []
+
+        async def wait(name):
+            ticket = await controller.acquire_slot()
+            order.append(name)
+            return ticket
+
+        tasks = [asyncio.create_task(wait(name)) for name in ("b", "c")]
+        await _settle()
+        controller.release(first)
+        controller.release(first)   # 두 번 반납해도 한 번만 반영
+        await _settle()
+        assert order == ["b"]
+
+        controller.release(await tasks[0])
+        controller.release(await tasks[1])
+        return order, controller.stats()
+
+    order, stats = asyncio.run(scenario())
+
+    assert order == ["b", "c"]
+    assert (stats['active'], stats['queue_depth'], stats['admitted']) == (0, 0, 3)
+
+
+def test_full_queue_and_timeout_are_rejected():
+    async def scenario():
+        controller = AdmissionController(max_active=1, max_queue=1, queue_timeout=0.05)
+        ticket = await controller.acquire_slot()
+        waiting = asyncio.create_task(controller.acquire_slot())
+        await _settle()
+
+        with pytest.raises(AdmissionRejected) as full:
+            await controller.acquire_slot()
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await waiting
+
+        controller.release(ticket)
+        return full.value, timed_out.value, controller.stats()
+
+    full, timed_out, stats = asyncio.run(scenario())
+
+    assert (full.status_code, full.reason) == (503, "queue_full")
+    assert (timed_out.status_code, timed_out.reason) == (503, "queue_timeout")
+    assert (stats['active'], stats['queue_depth']) == (0, 0)
+
+
+def test_waiter_cancelled_while_handed_a_slot_passes_it_on():
+    async def scenario():
+        controller = AdmissionController(max_active=1, max_queue=4, queue_timeout=5)
+        ticket = await controller.acquire_slot()
+        cancelled = asyncio.create_task(controller.acquire_slot())
+        next_waiter = asyncio.create_task(controller.acquire_slot())
+        await _settle()
+
+        # 슬롯을 넘겨받았지만 아직 깨어나지 않은 요청을 취소
+        controller.release(ticket)
+        cancelled.cancel()
+        await _settle()
+
+        assert cancelled.cancelled()
+        assert next_waiter.done()
+        active = controller.stats()['active']
+        controller.release(next_waiter.result())
+        return active, controller.stats()
+
+    active, stats = asyncio.run(scenario())
+
+    assert active == 1
+    assert (stats['active'], stats['queue_depth']) == (0, 0)
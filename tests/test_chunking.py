@@ -0,0 +1,61 @@
+from be.agent.chunking import split_code, merge_issues
+
+CODE = """import os
+LIMIT = 3
+
+
+def first(x):
+    return x + LIMIT
+
+
+def second(path):
+    return os.path.exists(path)
+
+
+def third():
+    return os.getcwd()
+"""
+
+
+def _issue(start_line, end_line, title="Issue"):
+    return {"title": title, "start_line": start_line, "end_line": end_line}
+
+
+def test_small_code_is_a_single_chunk():
+    chunks = split_code(CODE)
+
+    assert chunks == [{"code": CODE, "ranges": [(1, 14)]}]
+
+
+def test_syntax_error_is_a_single_chunk():
+    code = "def broken(:\n" + "x = 1\n" * 10
+
+    assert len(split_code(code, max_lines=3)) == 1
+
+
+def test_split_on_top_level_blocks_keeps_line_numbers_and_context():
+    chunks = split_code(CODE, max_lines=6)
+
+    assert [chunk['ranges'] for chunk in chunks] == [[(1, 6)], [(9, 14)]]
+    for chunk in chunks:
+        lines = chunk['code'].splitlines()
+        # import·대입문은 모든 청크에 문맥으로 포함되고, 나머지 줄은 빈 줄로 채워져 줄 번호가 원본과 같음
+        assert lines[:2] == ["import os", "LIMIT = 3"]
+        start, end = chunk['ranges'][0]
+        assert lines[start - 1:end] == CODE.splitlines()[start - 1:end]
+
+    assert chunks[1]['code'].splitlines()[4] == ""
+
+
+def test_merge_drops_issues_outside_chunk_range_and_duplicates():
+    results = [
+        ([_issue(5, 6, "Missing check"), _issue(9, 10, "Outside")], [(1, 6)]),
+        ([_issue(9, 10, "Path check"), _issue(9, 10, " path CHECK ")], [(9, 10)]),
+        ([_issue(5, 6, "Missing check"), _issue(13, 14)], [(1, 6), (13, 14)]),
+    ]
+
+    merged = merge_issues(results)
+
+    assert [(issue['start_line'], issue['title']) for issue in merged] == [
+        (5, "Missing check"), (9, "Path check"), (13, "Issue"),
+    ]
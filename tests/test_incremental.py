@@ -0,0 +1,77 @@
+from be.agent.incremental import plan_incremental, map_lines, in_ranges
+
+OLD_CODE = """import os
+
+
+def add_one(x):
+    y = x + 1
+    return y
+
+
+def run(path):
+    return os.system(path)
+"""
+
+# add_one 함수 본문에서 한 줄만 삭제
+NEW_CODE = """import os
+
+
+def add_one(x):
+    return y
+
+
+def run(path):
+    return os.system(path)
+"""
+
+RUN_ISSUE = {"title": "Command injection", "severity": "CRITICAL", "start_line": 10, "end_line": 10,
+             "code_snippet": ["    return os.system(path)"]}
+ADD_ONE_ISSUE = {"title": "Unused variable", "severity": "WARNING", "start_line": 5, "end_line": 6,
+                 "code_snippet": ["    y = x + 1", "    return y"]}
+
+
+def test_deleted_line_marks_enclosing_function_changed():
+    plan = plan_incremental(OLD_CODE, [], NEW_CODE)
+
+    assert plan['changed'] == [(4, 5)]
+
+
+def test_deletion_touches_neighbouring_lines_only():
+    line_map, touched = map_lines(OLD_CODE, NEW_CODE)
+
+    assert touched == {4, 5}
+    assert line_map[10] == 9
+    assert 5 not in line_map
+
+
+def test_unchanged_issue_is_carried_to_new_line_numbers():
+    plan = plan_incremental(OLD_CODE, [RUN_ISSUE, ADD_ONE_ISSUE], NEW_CODE)
+
+    assert plan['carried_issues'] == [dict(RUN_ISSUE, start_line=9, end_line=9)]
+
+
+def test_skeleton_keeps_line_numbers_and_elides_unchanged_bodies():
+    plan = plan_incremental(OLD_CODE, [], NEW_CODE)
+    lines = plan['skeleton'].splitlines()
+
+    assert len(lines) == len(NEW_CODE.splitlines())
+    assert lines[4] == "    return y"
+    assert lines[8] == "    ..."
+
+
+def test_no_change_carries_every_issue():
+    plan = plan_incremental(OLD_CODE, [RUN_ISSUE, ADD_ONE_ISSUE], OLD_CODE)
+
+    assert plan['changed'] == []
+    assert plan['carried_issues'] == [RUN_ISSUE, ADD_ONE_ISSUE]
+
+
+def test_syntax_error_or_large_change_falls_back_to_full_review():
+    assert plan_incremental(OLD_CODE, [], "def broken(:\n    pass\n") is None
+    assert plan_incremental(OLD_CODE, [], "x = 1\ny = 2\n") is None
+
+
+def test_in_ranges_rejects_missing_line_numbers():
+    assert in_ranges(4, 5, [(4, 5)])
+    assert not in_ranges(3, 5, [(4, 5)])
+    assert not in_ranges(None, 5, [(4, 5)])
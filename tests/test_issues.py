@@ -0,0 +1,75 @@
+import json
+import pytest
+from be.agent.issues import parse_issue_report, IssueParseError
+
+CODE = """import os
+
+
+def run(path):
+    os.system(path)
+    return True
+"""
+
+SYSTEM_ISSUE = {"title": "Command injection", "description": "", "issue_type": "Security Issue", "severity": "CRITICAL",
+                "start_line": 5, "end_line": 5, "code_snippet": ["    os.system(path)"]}
+
+
+def test_plain_and_fenced_json():
+    output = json.dumps({"pylint_score": 7.5, "issues": [SYSTEM_ISSUE]})
+
+    assert parse_issue_report(output, CODE) == ([SYSTEM_ISSUE], 7.5)
+    assert parse_issue_report(f"```json\n{output}\n```", CODE) == ([SYSTEM_ISSUE], 7.5)
+
+
+def test_surrounding_text_and_top_level_array():
+    output = "Here is the review:\n" + json.dumps([SYSTEM_ISSUE]) + "\nLet me know if you need more."
+
+    assert parse_issue_report(output, CODE) == ([SYSTEM_ISSUE], None)
+
+
+def test_truncated_issues_array_keeps_complete_objects():
+    second = dict(SYSTEM_ISSUE, title="Always returns True", start_line=6, end_line=6, code_snippet=["    return True"])
+    output = json.dumps({"pylint_score": 6.0, "issues": [SYSTEM_ISSUE, second]})
+    truncated = output[:output.index('"Always returns True"') + 10]
+
+    issues, pylint_score = parse_issue_report(truncated, CODE)
+
+    assert issues == [SYSTEM_ISSUE]
+    assert pylint_score == 6.0
+
+
+def test_unparseable_output_raises():
+    with pytest.raises(IssueParseError):
+        parse_issue_report("No issues found.", CODE)
+    with pytest.raises(IssueParseError):
+        parse_issue_report('{"issues": [{"title": "cut', CODE)
+
+
+def test_moved_snippet_relocates_line_numbers():
+    # LLM이 잘못된 줄 번호를 보고해도 코드 조각이 있는 위치로 이동
+    reported = dict(SYSTEM_ISSUE, start_line=2, end_line=2)
+
+    issues, _ = parse_issue_report(json.dumps({"issues": [reported]}), CODE)
+
+    assert (issues[0]['start_line'], issues[0]['end_line']) == (5, 5)
+
+
+def test_unknown_snippet_is_replaced_with_source_lines():
+    reported = dict(SYSTEM_ISSUE, start_line=4, end_line=5, code_snippet="def run(path):\n    subprocess.call(path)")
+
+    issues, _ = parse_issue_report(json.dumps({"issues": [reported]}), CODE)
+
+    assert issues[0]['code_snippet'] == ["def run(path):", "    os.system(path)"]
+
+
+def test_invalid_issues_are_dropped_and_severity_normalized():
+    items = [
+        dict(SYSTEM_ISSUE, severity="critical"),
+        dict(SYSTEM_ISSUE, severity="minor", start_line=6, end_line=6, code_snippet=[]),
+        {"title": "No line numbers"},
+        dict(SYSTEM_ISSUE, start_line=40, end_line=41, code_snippet=[]),
+    ]
+
+    issues, _ = parse_issue_report(json.dumps({"pylint_score": "n/a", "issues": items}), CODE)
+
+    assert [(issue['start_line'], issue['severity']) for issue in issues] == [(5, "CRITICAL"), (6, "CRITICAL")]